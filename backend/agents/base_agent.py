@@ -3,8 +3,11 @@ from typing import Any
 from pydantic import BaseModel
 from datetime import datetime
 import json
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 
 class AgentOutput(BaseModel):
     agent_name: str
@@ -14,6 +17,8 @@ class AgentOutput(BaseModel):
     sources: list[str]
     reasoning: str
     timestamp: datetime
+    # True when this is demo data from get_fallback_output, not a model answer
+    fallback: bool = False
 
 
 class BaseAgent(ABC):
@@ -65,8 +70,10 @@ class BaseAgent(ABC):
             )
             return self.parse_output(response.text)
         except Exception as e:
-            print(f"[{self.agent_name}] API error: {e} — using demo fallback")
-            return self.get_fallback_output(raw_input)
+            logger.warning("[%s] API error: %s — using demo fallback", self.agent_name, e)
+            output = self.get_fallback_output(raw_input)
+            output.fallback = True
+            return output
 
     def _convert_messages(self, messages: list[dict]) -> list[dict]:
         """Convert messages to Gemini content format."""
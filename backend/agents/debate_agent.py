@@ -4,6 +4,7 @@ to resolve a contradiction. Used by the Debate Room page.
 """
 import asyncio
 import functools
+import logging
 from datetime import datetime
 from typing import Any
 import google.generativeai as genai
@@ -11,6 +12,7 @@ import google.generativeai as genai
 from agents.base_agent import BaseAgent, AgentOutput
 from graph.schemas import ContradictionAlert, DebateTurn
 
+logger = logging.getLogger(__name__)
 
 DEFENDER_SYSTEM = """You are a field intelligence analyst defending a specific information source during a contradiction review.
 
@@ -63,6 +65,17 @@ class DebateAgent:
 
     def __init__(self, model_name: str = "gemini-2.0-flash"):
         self.model_name = model_name
+        # One model per system prompt, reused across turns and debates
+        self._models: dict[str, genai.GenerativeModel] = {}
+
+    def _get_model(self, system: str) -> genai.GenerativeModel:
+        model = self._models.get(system)
+        if model is None:
+            model = self._models[system] = genai.GenerativeModel(
+                model_name=self.model_name,
+                system_instruction=system
+            )
+        return model
 
     async def run_debate(
         self,
@@ -201,10 +214,7 @@ Temporal context: {alert.temporal_analysis or 'No temporal data available'}"""
         gemini_contents.append({"role": "user", "parts": [user_msg]})
 
         try:
-            model = genai.GenerativeModel(
-                model_name=self.model_name,
-                system_instruction=system
-            )
+            model = self._get_model(system)
             response = await asyncio.to_thread(
                 functools.partial(
                     model.generate_content,
@@ -244,7 +254,7 @@ Temporal context: {alert.temporal_analysis or 'No temporal data available'}"""
                 timestamp=datetime.utcnow()
             )
         except Exception as e:
-            print(f"[DebateAgent] Turn {turn_number} API error: {e} — using fallback")
+            logger.warning("Turn %s API error: %s — using fallback", turn_number, e)
             return self._fallback_turn(turn_number, agent_name, role)
 
     def _fallback_turn(self, turn_number: int, agent_name: str, role: str) -> DebateTurn:
@@ -6,11 +6,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+import logging
 import google.generativeai as genai
 
 from config import get_settings
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 def get_coordinator():
@@ -142,7 +144,7 @@ async def ask_copilot(
         )
         answer = response.text
     except Exception as e:
-        print(f"[Copilot] API error: {e} — using fallback")
+        logger.warning("API error: %s — using fallback", e)
         answer = _fallback_answer(request.question, coordinator)
 
     return CopilotResponse(
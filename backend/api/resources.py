@@ -2,11 +2,13 @@
 Resource Allocation & Camp Management API routes.
 """
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import Optional
-from datetime import datetime
 import uuid
 
+from graph.encoding import dumps
+
 router = APIRouter()
 
 
@@ -29,42 +31,38 @@ class AssignResourceRequest(BaseModel):
 async def get_allocation_state(coordinator=Depends(get_coordinator)):
     """Get current resource allocation overview."""
     graph = coordinator.graph_manager.graph
-    resources = [r.model_dump(mode="json") for r in graph.resources.values()]
-    incidents = [i.model_dump(mode="json") for i in graph.incidents.values() if i.status == "active"]
-    plans = [p.model_dump(mode="json") for p in graph.allocation_plans.values()]
-    camps = [c.model_dump(mode="json") for c in graph.camp_locations.values()]
-    return {
-        "resources": resources,
-        "incidents": incidents,
-        "allocation_plans": plans,
-        "camps": camps,
+    return Response(dumps({
+        "resources": list(graph.resources.values()),
+        "incidents": [i for i in graph.incidents.values() if i.status == "active"],
+        "allocation_plans": list(graph.allocation_plans.values()),
+        "camps": list(graph.camp_locations.values()),
         "stats": coordinator.graph_manager.get_stats()
-    }
+    }), media_type="application/json")
 
 
 @router.post("/resources/assign")
 async def assign_resource(body: AssignResourceRequest, coordinator=Depends(get_coordinator)):
     """Manually assign a resource to an incident."""
-    from api.websocket import broadcast
+    from api.websocket import broadcast_graph_update
 
     result = coordinator.graph_manager.assign_resource_manual(body.resource_id, body.incident_id)
     if not result:
         raise HTTPException(404, "Resource or incident not found")
 
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+    await broadcast_graph_update(coordinator.graph_manager)
     return {"status": "assigned", "resource_id": body.resource_id, "incident_id": body.incident_id}
 
 
 @router.post("/resources/unassign/{resource_id}")
 async def unassign_resource(resource_id: str, coordinator=Depends(get_coordinator)):
     """Unassign a resource from its current assignment."""
-    from api.websocket import broadcast
+    from api.websocket import broadcast_graph_update
 
     result = coordinator.graph_manager.unassign_resource(resource_id)
     if not result:
         raise HTTPException(404, "Resource not found")
 
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+    await broadcast_graph_update(coordinator.graph_manager)
     return {"status": "unassigned", "resource_id": resource_id}
 
 
@@ -81,7 +79,7 @@ async def generate_allocation_plan(coordinator=Depends(get_coordinator)):
 @router.post("/resources/plans/{plan_id}/approve")
 async def approve_plan(plan_id: str, coordinator=Depends(get_coordinator)):
     """Approve an allocation plan — executes all suggested assignments."""
-    from api.websocket import broadcast
+    from api.websocket import broadcast_graph_update
 
     plan = coordinator.graph_manager.graph.allocation_plans.get(plan_id)
     if not plan:
@@ -99,8 +97,8 @@ async def approve_plan(plan_id: str, coordinator=Depends(get_coordinator)):
         if camp.status == "suggested":
             coordinator.graph_manager.add_camp(camp)
 
-    coordinator.graph_manager.graph.last_updated = datetime.utcnow()
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+    coordinator.graph_manager.touch("allocation_plans", plan_id)
+    await broadcast_graph_update(coordinator.graph_manager)
     return {"status": "approved", "plan_id": plan_id}
 
 
@@ -126,24 +124,24 @@ async def get_camps(coordinator=Depends(get_coordinator)):
 @router.post("/camps/{camp_id}/approve")
 async def approve_camp(camp_id: str, coordinator=Depends(get_coordinator)):
     """Approve a camp recommendation."""
-    from api.websocket import broadcast
+    from api.websocket import broadcast_graph_update
 
     camp = coordinator.graph_manager.approve_camp(camp_id)
     if not camp:
         raise HTTPException(404, "Camp not found")
 
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+    await broadcast_graph_update(coordinator.graph_manager)
     return {"status": "approved", "camp_id": camp_id}
 
 
 @router.post("/camps/{camp_id}/reject")
 async def reject_camp(camp_id: str, coordinator=Depends(get_coordinator)):
     """Reject a camp recommendation."""
-    from api.websocket import broadcast
+    from api.websocket import broadcast_graph_update
 
     camp = coordinator.graph_manager.reject_camp(camp_id)
     if not camp:
         raise HTTPException(404, "Camp not found")
 
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+    await broadcast_graph_update(coordinator.graph_manager)
     return {"status": "rejected", "camp_id": camp_id}
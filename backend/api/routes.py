@@ -1,10 +1,14 @@
 """
 REST API routes for CrisisCore backend.
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import Response
+from pydantic import ValidationError
 from typing import Optional
 import base64
 
+from graph.encoding import dumps
 from graph.schemas import (
     SituationGraph,
     SignalInput,
@@ -22,6 +26,46 @@ def get_coordinator():
     return coord
 
 
+def _json_body(model):
+    """Dependency that validates the raw request body straight from JSON bytes.
+
+    pydantic-core parses and validates in one pass, skipping FastAPI's
+    json.loads -> dict -> model round trip on the hot ingest endpoints.
+    """
+    async def parse(request: Request):
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors()])
+    return parse
+
+
+def _json_body_openapi(model) -> dict:
+    """openapi_extra documenting `model` as the JSON request body of a _json_body route.
+
+    FastAPI only sees an opaque Request there, so the schema is supplied by hand;
+    nested $defs are inlined since the model isn't registered under components.
+    """
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def inline(node):
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return inline(defs[ref.removeprefix("#/$defs/")])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(value) for value in node]
+        return node
+
+    return {"requestBody": {"content": {"application/json": {"schema": inline(schema)}}, "required": True}}
+
+
+parse_signal = _json_body(SignalInput)
+parse_decision = _json_body(HumanDecision)
+
+
 # ============== HEALTH ==============
 
 @router.get("/health")
@@ -34,13 +78,13 @@ async def health():
 @router.get("/graph")
 async def get_graph(coordinator=Depends(get_coordinator)):
     """Get current situation graph state."""
-    return coordinator.graph_manager.graph.model_dump(mode="json")
+    return Response(coordinator.graph_manager.snapshot_json(), media_type="application/json")
 
 
 @router.get("/graph/incidents")
 async def get_incidents(coordinator=Depends(get_coordinator)):
     """Get all incidents."""
-    return {k: v.model_dump(mode="json") for k, v in coordinator.graph_manager.graph.incidents.items()}
+    return Response(dumps(coordinator.graph_manager.graph.incidents), media_type="application/json")
 
 
 @router.get("/graph/incidents/{incident_id}")
@@ -54,7 +98,7 @@ async def get_incident(incident_id: str, coordinator=Depends(get_coordinator)):
 @router.get("/graph/resources")
 async def get_resources(coordinator=Depends(get_coordinator)):
     """Get all resources."""
-    return {k: v.model_dump(mode="json") for k, v in coordinator.graph_manager.graph.resources.items()}
+    return Response(dumps(coordinator.graph_manager.graph.resources), media_type="application/json")
 
 
 @router.get("/graph/stats")
@@ -107,9 +151,9 @@ async def ingest_audio(
     return result
 
 
-@router.post("/signals/text")
+@router.post("/signals/text", openapi_extra=_json_body_openapi(SignalInput))
 async def ingest_text(
-    signal_input: SignalInput,
+    signal_input: SignalInput = Depends(parse_signal),
     coordinator=Depends(get_coordinator)
 ):
     """Ingest a text signal."""
@@ -134,16 +178,15 @@ async def get_pending_decisions(coordinator=Depends(get_coordinator)):
         ],
         "actions": [
             a.model_dump(mode="json")
-            for a in coordinator.graph_manager.graph.pending_actions.values()
-            if a.status == "pending"
+            for a in coordinator.graph_manager.get_pending_actions()
         ]
     }
 
 
-@router.post("/decisions/contradiction/{alert_id}")
+@router.post("/decisions/contradiction/{alert_id}", openapi_extra=_json_body_openapi(HumanDecision))
 async def resolve_contradiction(
     alert_id: str,
-    decision: HumanDecision,
+    decision: HumanDecision = Depends(parse_decision),
     coordinator=Depends(get_coordinator)
 ):
     """Resolve a contradiction alert."""
@@ -244,7 +287,7 @@ async def get_incident_audit(
 @router.get("/timeline")
 async def get_timeline(coordinator=Depends(get_coordinator)):
     """Get recent timeline events."""
-    return {"events": coordinator.recent_events[-30:]}
+    return {"events": coordinator.recent_events_tail(30)}
 
 
 # ============== DEBATE ==============
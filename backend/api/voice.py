@@ -6,11 +6,13 @@ from fastapi.responses import Response
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
+import logging
 import uuid
 
 from config import get_settings
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
 def get_coordinator():
@@ -57,7 +59,7 @@ async def get_situation_report(coordinator=Depends(get_coordinator)):
         )
         report_text = response.text
     except Exception as e:
-        print(f"[Voice] AI report generation failed: {e}")
+        logger.warning("AI report generation failed: %s", e)
         graph = coordinator.graph_manager.graph
         incidents = len(graph.incidents)
         critical = len([i for i in graph.incidents.values() if i.urgency.value == "critical"])
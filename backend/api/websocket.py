@@ -2,13 +2,26 @@
 WebSocket handler for real-time updates to dashboard clients.
 """
 from fastapi import WebSocket, WebSocketDisconnect
-from typing import Set
+from typing import Optional, Set
+import asyncio
 import json
+import logging
 from datetime import datetime
 
+import orjson
+
+logger = logging.getLogger(__name__)
+
 # Active connections
 connections: Set[WebSocket] = set()
 
+# Clients sent to per slice before yielding to the event loop
+BROADCAST_CHUNK_SIZE = 50
+
+# graph_update requests within this window (seconds) share one broadcast
+GRAPH_UPDATE_DELAY = 0.05
+_graph_update_task: Optional[asyncio.Task] = None
+
 
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
@@ -19,11 +32,7 @@ async def websocket_endpoint(websocket: WebSocket):
         from main import get_coordinator
         coordinator = get_coordinator()
         if coordinator:
-            await websocket.send_json({
-                "type": "initial_state",
-                "payload": coordinator.graph_manager.graph.model_dump(mode="json"),
-                "timestamp": datetime.utcnow().isoformat()
-            })
+            await websocket.send_text(_graph_frame("initial_state", coordinator.graph_manager))
             await websocket.send_json({
                 "type": "sim_status",
                 "payload": coordinator.get_simulation_status(),
@@ -70,11 +79,16 @@ async def websocket_endpoint(websocket: WebSocket):
                             await coordinator.reject_action(item_id, payload.get("reason"))
 
                 elif msg_type == "request_refresh":
-                    await websocket.send_json({
-                        "type": "graph_update",
-                        "payload": coordinator.graph_manager.graph.model_dump(mode="json"),
-                        "timestamp": datetime.utcnow().isoformat()
-                    })
+                    await websocket.send_text(_graph_frame("graph_update", coordinator.graph_manager))
+
+                elif msg_type == "request_sync":
+                    # Client saw a gap in graph_patch versions: replay what it missed if we still have it
+                    since = message.get("payload", {}).get("since")
+                    patches = coordinator.graph_manager.patches_since(since) if isinstance(since, int) else None
+                    if patches is None:
+                        await websocket.send_text(_graph_frame("graph_update", coordinator.graph_manager))
+                    elif patches:
+                        await websocket.send_text(_batch_frame([("graph_patch", patch) for patch in patches]))
 
                 elif msg_type == "start_simulation":
                     payload = message.get("payload", {})
@@ -93,12 +107,12 @@ async def websocket_endpoint(websocket: WebSocket):
                     await coordinator.reset_simulation()
 
             except Exception as e:
-                print(f"WebSocket message handler error ({msg_type}): {e}")
+                logger.error("WebSocket message handler error (%s): %s", msg_type, e)
 
     except WebSocketDisconnect:
         connections.discard(websocket)
     except Exception as e:
-        print(f"WebSocket error: {e}")
+        logger.warning("WebSocket error: %s", e)
         connections.discard(websocket)
 
 
@@ -109,14 +123,86 @@ async def broadcast(message_type: str, payload: dict):
         "payload": payload,
         "timestamp": datetime.utcnow().isoformat()
     }
-
-    disconnected = set()
-    for ws in connections:
-        try:
-            await ws.send_json(message)
-        except Exception:
-            disconnected.add(ws)
-
-    # Clean up disconnected
-    for ws in disconnected:
-        connections.discard(ws)
+    await _send_to_all(orjson.dumps(message).decode())
+
+
+async def broadcast_many(events: list[tuple[str, dict | bytes]]):
+    """Broadcast several messages to all clients as a single "batch" frame.
+
+    Payloads may be dicts or JSON bytes that were already serialized.
+    """
+    if not events:
+        return
+    await _send_to_all(_batch_frame(events))
+
+
+def _batch_frame(events: list[tuple[str, dict | bytes]]) -> str:
+    """A single "batch" frame carrying several messages."""
+    timestamp = datetime.utcnow().isoformat()
+    return orjson.dumps({
+        "type": "batch",
+        "payload": [
+            {
+                "type": message_type,
+                "payload": orjson.Fragment(payload) if isinstance(payload, bytes) else payload,
+                "timestamp": timestamp
+            }
+            for message_type, payload in events
+        ],
+        "timestamp": timestamp
+    }).decode()
+
+
+async def broadcast_raw(message_type: str, payload_json: bytes):
+    """Broadcast a message whose payload is already serialized JSON."""
+    await _send_to_all(_raw_frame(message_type, payload_json))
+
+
+async def broadcast_graph_update(graph_manager):
+    """Broadcast the full graph now, stamped with its patch version."""
+    await _send_to_all(_graph_frame("graph_update", graph_manager))
+
+
+def _raw_frame(message_type: str, payload_json: bytes, version: Optional[int] = None) -> str:
+    """Message envelope around an already-serialized JSON payload."""
+    return b"".join((
+        b'{"type":', orjson.dumps(message_type),
+        b',"payload":', payload_json,
+        b',"version":%d' % version if version is not None else b"",
+        b',"timestamp":', orjson.dumps(datetime.utcnow().isoformat()),
+        b"}"
+    )).decode()
+
+
+def _graph_frame(message_type: str, graph_manager) -> str:
+    """Full-graph message; "version" is the last graph_patch the snapshot already includes."""
+    return _raw_frame(message_type, graph_manager.snapshot_json(), graph_manager.patch_version)
+
+
+def schedule_graph_update(graph_manager):
+    """Queue a full graph_update broadcast, coalesced with any others in the next GRAPH_UPDATE_DELAY."""
+    global _graph_update_task
+    if _graph_update_task is None or _graph_update_task.done():
+        _graph_update_task = asyncio.create_task(_flush_graph_update(graph_manager))
+
+
+async def _flush_graph_update(graph_manager):
+    global _graph_update_task
+    await asyncio.sleep(GRAPH_UPDATE_DELAY)
+    # Clear before snapshotting so changes made during the send schedule another update
+    _graph_update_task = None
+    await broadcast_graph_update(graph_manager)
+
+
+async def _send_to_all(text: str):
+    """Send one encoded frame to every client, a slice of clients at a time."""
+    clients = list(connections)
+    for start in range(0, len(clients), BROADCAST_CHUNK_SIZE):
+        if start:
+            await asyncio.sleep(0)
+        chunk = clients[start:start + BROADCAST_CHUNK_SIZE]
+        # Sends within a slice run concurrently so one slow client doesn't hold up the rest
+        results = await asyncio.gather(*(ws.send_text(text) for ws in chunk), return_exceptions=True)
+        for ws, result in zip(chunk, results):
+            if isinstance(result, Exception):
+                connections.discard(ws)
@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     elevenlabs_api_key: str = ""
     cors_origins: List[str] = ["http://localhost:5173", "http://localhost:3000"]
     simulation_speed: float = 1.0
+    audit_spill_path: str = ""  # ndjson file for audit events evicted from memory
+    log_level: str = "INFO"
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,39 @@
+"""
+Fast JSON encoding for graph models on the broadcast path.
+
+Reads pydantic models straight from __dict__ instead of going through
+model_dump(mode="json"); the output matches model_dump for the graph schemas.
+"""
+from enum import Enum
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+
+
+def _encode(o: Any) -> Any:
+    """orjson `default` hook for types it doesn't serialize natively."""
+    if isinstance(o, BaseModel):
+        # Reuse a node's cached serialization (see dumps_node) when it has one
+        private = o.__pydantic_private__
+        if private and private.get("_cached_json") is not None:
+            return orjson.Fragment(private["_cached_json"])
+        return o.__dict__
+    if isinstance(o, Enum):
+        return o.value
+    raise TypeError(f"Type is not JSON serializable: {type(o).__name__}")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize a model (or any structure containing models) to JSON bytes."""
+    return orjson.dumps(obj, default=_encode)
+
+
+def dumps_node(node: BaseModel) -> bytes:
+    """dumps() for a graph node, reusing its `_cached_json` bytes when the model has that slot."""
+    if "_cached_json" not in node.__private_attributes__:
+        return dumps(node)
+    data = node._cached_json
+    if data is None:
+        data = node._cached_json = dumps(node)
+    return data
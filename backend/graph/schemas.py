@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 from typing import Literal, Optional, Any
 from datetime import datetime
 from enum import Enum
@@ -21,6 +21,10 @@ class Urgency(str, Enum):
     LOW = "low"
 
 
+# Sort order for urgencies (lower = more urgent)
+URGENCY_RANK = {Urgency.CRITICAL: 0, Urgency.HIGH: 1, Urgency.MEDIUM: 2, Urgency.LOW: 3}
+
+
 class SourceType(str, Enum):
     IMAGE = "image"
     AUDIO = "audio"
@@ -93,6 +97,11 @@ class IncidentNode(BaseModel):
     status: Literal["active", "responding", "contained", "resolved"] = "active"
     assigned_resources: list[str] = []
 
+    # Planning-prompt projection; built by the graph manager, reset when the node changes
+    _ctx_dict: Optional[dict] = PrivateAttr(default=None)
+    # Serialized JSON reused across broadcasts; cleared by the graph manager on mutation
+    _cached_json: Optional[bytes] = PrivateAttr(default=None)
+
 
 class ResourceNode(BaseModel):
     id: str
@@ -167,6 +176,17 @@ class AgentOutput(BaseModel):
     timestamp: datetime
 
 
+# Entity name -> entity_id for ASCII names, in one pass: lowercase, spaces to underscores
+_ENTITY_ID_TRANS = str.maketrans(" ABCDEFGHIJKLMNOPQRSTUVWXYZ", "_abcdefghijklmnopqrstuvwxyz")
+
+
+def entity_id_for(entity_name: str) -> str:
+    """ContradictionAlert.entity_id for an entity name ("Main Street Bridge" -> "main_street_bridge")."""
+    if entity_name.isascii():
+        return entity_name.translate(_ENTITY_ID_TRANS)
+    return entity_name.lower().replace(" ", "_")
+
+
 class ContradictionAlert(BaseModel):
     id: str
     entity_id: str
@@ -191,6 +211,9 @@ class ContradictionAlert(BaseModel):
     resolved_by: Optional[str] = None
     resolved_at: Optional[datetime] = None
 
+    # Serialized JSON reused across broadcasts; cleared by the graph manager on mutation
+    _cached_json: Optional[bytes] = PrivateAttr(default=None)
+
 
 class ActionRecommendation(BaseModel):
     id: str
@@ -219,6 +242,7 @@ class ActionRecommendation(BaseModel):
     requires_human_approval: bool = True
     decision_deadline: datetime
     time_sensitivity: Urgency
+    time_sensitivity_rank: int = 4  # derived from time_sensitivity, used for ordering
 
     # Status
     status: Literal["pending", "approved", "rejected", "executed", "expired"] = "pending"
@@ -226,6 +250,14 @@ class ActionRecommendation(BaseModel):
     decided_at: Optional[datetime] = None
     decided_by: Optional[str] = None
 
+    # Serialized JSON reused across broadcasts; cleared by the graph manager on mutation
+    _cached_json: Optional[bytes] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def _rank_time_sensitivity(self) -> "ActionRecommendation":
+        self.time_sensitivity_rank = URGENCY_RANK.get(self.time_sensitivity, 4)
+        return self
+
 
 # ============== RESOURCE ALLOCATION ==============
 
@@ -1,43 +1,244 @@
 """
 SituationGraph manager - handles all in-memory graph state.
 """
+import asyncio
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
+from itertools import islice
+from typing import Iterable, Optional
+import json
+import logging
+import math
+import mmap
+import os
+import re
 import uuid
 
+import numpy as np
+import orjson
+
+from graph.encoding import dumps, dumps_node
 from graph.schemas import (
     SituationGraph, IncidentNode, ResourceNode, LocationNode,
     GraphEdge, ContradictionAlert, ActionRecommendation,
     AllocationPlan, CampRecommendation, ResourceAssignment, VoiceReport,
-    DamageLevel, Urgency, Location, SourceReference, SourceType
+    DamageLevel, Urgency, Location, SourceReference, SourceType, URGENCY_RANK
 )
 
+logger = logging.getLogger(__name__)
+
+# Audit trail bounds: keep at most AUDIT_LOG_MAXLEN events in memory; when the
+# buffer is full the oldest AUDIT_SPILL_BATCH events are flushed to disk (if a
+# spill path is configured) or simply evicted. Spill-file I/O runs on one
+# background thread, so writes, scans and truncation happen in order.
+AUDIT_LOG_MAXLEN = 100_000
+AUDIT_SPILL_BATCH = 10_000
+
+# Struct-of-arrays mirror of the incident fields used by the hot numeric paths
+# (distance queries, confidence decay, stats). The pydantic nodes stay the
+# source of truth for the API; rows are kept in sync by the mutators below.
+INCIDENT_ROW_DTYPE = np.dtype([
+    ("lat", "f8"), ("lng", "f8"),
+    ("urg", "i1"), ("st", "i1"),
+    ("conf", "f8"), ("decay", "f8"),
+])
+INCIDENT_STATUS_CODES = {"active": 0, "responding": 1, "contained": 2, "resolved": 3}
+# Urgencies the planner treats as needing immediate resources
+CRITICAL_URGENCIES = frozenset({Urgency.CRITICAL, Urgency.HIGH})
+_INITIAL_INCIDENT_CAPACITY = 64
+
+# Collections whose nodes cache their serialized JSON (see encoding.dumps_node)
+_JSON_CACHED_COLLECTIONS = frozenset({"incidents", "contradictions", "pending_actions"})
+
+# Top-level SituationGraph scalars carried in graph patches
+GRAPH_META_FIELDS = {"scenario_id", "scenario_name", "scenario_start_time", "current_sim_time", "last_updated"}
+
+# Recent graph patches kept for clients that missed some (see patches_since)
+PATCH_LOG_SIZE = 256
+
+# Max number of cached node dumps served by the audit endpoints
+DUMP_CACHE_SIZE = 1024
+
 
 class SituationGraphManager:
-    def __init__(self):
-        self.graph = SituationGraph(
+    def __init__(self, audit_spill_path: Optional[str] = None):
+        self._graph = SituationGraph(
             scenario_id="",
             scenario_name="",
             scenario_start_time=datetime.utcnow(),
             current_sim_time=datetime.utcnow(),
             last_updated=datetime.utcnow()
         )
-        # Audit trail: list of events
-        self.audit_log: list[dict] = []
+        # Audit trail: bounded ring buffer of events, oldest spilled to ndjson
+        self.audit_log: deque[dict] = deque(maxlen=AUDIT_LOG_MAXLEN)
+        self.audit_spill_path = audit_spill_path
+        self._audit_io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-spill") if audit_spill_path else None
+        self._clear_audit_spill()
+        # Incident table: row i mirrors graph.incidents[self._inc_ids[i]]
+        self._incidents_arr = np.zeros(_INITIAL_INCIDENT_CAPACITY, dtype=INCIDENT_ROW_DTYPE)
+        self._inc_index: dict[str, int] = {}
+        self._inc_ids: list[str] = []
+        # Rows whose decayed confidence has not been written back to the node yet
+        self._stale_conf_rows: set[int] = set()
+        # Planning indexes, kept in sync by _index_incident / _index_resource
+        self.active_critical_incidents: set[str] = set()
+        self.unassigned_incidents: set[str] = set()
+        self.available_resources_by_sector: dict[str, set[str]] = {}
+        self._available_sector: dict[str, str] = {}  # available resource id -> sector key
+        self._res_seq: dict[str, int] = {}  # resource id -> insertion order
+        # node_id -> (stamp, model_dump()) for unchanged nodes, LRU-bounded
+        self._dump_cache: OrderedDict[str, tuple[Optional[datetime], dict]] = OrderedDict()
+        # Set by mutators; last_updated is stamped once per tick by commit()
+        self._dirty_flag = False
+        # (collection, node_id) changed since the last take_patch()
+        self._touched: set[tuple[str, str]] = set()
+        self._patch_version = 0
+        self._patch_log: deque[dict] = deque(maxlen=PATCH_LOG_SIZE)
+        self._sent_meta: dict = {}
+        # snapshot_json() bytes, dropped by _mark_changed
+        self._snapshot_json: Optional[bytes] = None
+        # Bumped on every location change; keys the hospital capacity cache
+        self.locations_version = 0
+        self._hospital_capacity: dict[bool, tuple[int, dict[str, str]]] = {}
+
+    @property
+    def graph(self) -> SituationGraph:
+        """The situation graph; pending decayed confidences are written back first."""
+        if self._stale_conf_rows:
+            self._flush_confidences()
+        return self._graph
 
     def reset(self):
-        self.graph = SituationGraph(
+        self._graph = SituationGraph(
             scenario_id="",
             scenario_name="",
             scenario_start_time=datetime.utcnow(),
             current_sim_time=datetime.utcnow(),
             last_updated=datetime.utcnow()
         )
-        self.audit_log = []
+        self.audit_log = deque(maxlen=AUDIT_LOG_MAXLEN)
+        self._clear_audit_spill()
+        self._incidents_arr = np.zeros(_INITIAL_INCIDENT_CAPACITY, dtype=INCIDENT_ROW_DTYPE)
+        self._inc_index = {}
+        self._inc_ids = []
+        self._stale_conf_rows = set()
+        self.active_critical_incidents = set()
+        self.unassigned_incidents = set()
+        self.available_resources_by_sector = {}
+        self._available_sector = {}
+        self._res_seq = {}
+        self._dump_cache.clear()
+        self._dirty_flag = False
+        self._touched = set()
+        self._patch_log.clear()
+        self._sent_meta = {}
+        self._snapshot_json = None
+        self.locations_version += 1
+
+    # ============== CHANGE TRACKING ==============
+
+    def _mark_changed(self, collection: Optional[str] = None, *node_ids: str):
+        self._dirty_flag = True
+        self._snapshot_json = None
+        if collection == "locations":
+            self.locations_version += 1
+        nodes = getattr(self._graph, collection) if collection in _JSON_CACHED_COLLECTIONS else None
+        for node_id in node_ids:
+            self._touched.add((collection, node_id))
+            if nodes is not None and node_id in nodes:
+                nodes[node_id]._cached_json = None
+
+    def touch(self, collection: Optional[str] = None, *node_ids: str):
+        """Flag the graph as changed after a direct edit to one of its nodes."""
+        self._mark_changed(collection, *node_ids)
+
+    def set_scenario(self, scenario_id: str, scenario_name: str, start_time: datetime):
+        """Start the graph clock for a scenario."""
+        graph = self._graph
+        graph.scenario_id = scenario_id
+        graph.scenario_name = scenario_name
+        graph.scenario_start_time = start_time
+        graph.current_sim_time = start_time
+        self._mark_changed()
+
+    def set_sim_time(self, sim_time: datetime):
+        """Advance the simulation clock."""
+        self._graph.current_sim_time = sim_time
+        self._mark_changed()
+
+    def commit(self, now: Optional[datetime] = None) -> bool:
+        """Stamp last_updated once for all changes since the previous commit."""
+        if not self._dirty_flag:
+            return False
+        # Bypass pydantic __setattr__: the value is always a datetime
+        self._graph.__dict__["last_updated"] = now or datetime.utcnow()
+        self._dirty_flag = False
+        return True
+
+    def snapshot_json(self) -> bytes:
+        """JSON bytes of the whole graph with last_updated committed, reused until the graph changes."""
+        if self._snapshot_json is None:
+            self.commit()
+            self._snapshot_json = dumps(self.graph)
+        return self._snapshot_json
+
+    def take_patch(self) -> Optional[dict]:
+        """JSON-Patch style delta of the nodes and metadata changed since the last call.
+
+        Returns None when nothing changed. Each patch takes a client from version
+        "from" to "version" and is kept in a short log for patches_since().
+        Nodes are only ever added or replaced, so every op is an "add" (which
+        JSON Patch treats as replace when present).
+        Node values are pre-encoded orjson Fragments; serialize with orjson.
+        """
+        self.commit()
+        graph = self.graph
+        ops = []
+        for collection, node_id in self._touched:
+            node = getattr(graph, collection).get(node_id)
+            if node is None:
+                ops.append({"op": "remove", "path": f"/{collection}/{node_id}"})
+            else:
+                ops.append({"op": "add", "path": f"/{collection}/{node_id}", "value": orjson.Fragment(dumps_node(node))})
+        self._touched.clear()
+
+        meta = graph.model_dump(mode="json", include=GRAPH_META_FIELDS)
+        meta_changed = False
+        for field, value in meta.items():
+            if self._sent_meta.get(field) != value:
+                ops.append({"op": "replace", "path": f"/{field}", "value": value})
+                meta_changed = True
+        self._sent_meta = meta
+        if meta_changed:
+            # A cached snapshot labelled with this version must include these values too
+            self._snapshot_json = None
+
+        if not ops:
+            return None
+        patch = {"from": self._patch_version, "version": self._patch_version + 1, "ops": ops}
+        self._patch_version += 1
+        self._patch_log.append(patch)
+        return patch
+
+    @property
+    def patch_version(self) -> int:
+        """Version of the last patch taken; a snapshot taken now is current as of this version."""
+        return self._patch_version
+
+    def patches_since(self, version: int) -> Optional[list[dict]]:
+        """Patches that bring a client at `version` up to date, or None if the log no longer covers it."""
+        if version == self._patch_version:
+            return []
+        log = self._patch_log
+        if not log or not log[0]["from"] <= version < self._patch_version:
+            return None
+        return list(islice(log, version - log[0]["from"], None))
 
     def add_incident(self, incident: IncidentNode) -> IncidentNode:
         self.graph.incidents[incident.id] = incident
-        self.graph.last_updated = datetime.utcnow()
+        self._index_incident(incident)
+        self._mark_changed("incidents", incident.id)
         self._log_event("incident_added", {"incident_id": incident.id, "type": incident.incident_type})
         return incident
 
@@ -48,16 +249,29 @@ class SituationGraphManager:
         for key, value in updates.items():
             if hasattr(incident, key):
                 setattr(incident, key, value)
+        self._index_incident(incident)
         incident.updated_at = datetime.utcnow()
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("incidents", incident_id)
         self._log_event("incident_updated", {"incident_id": incident_id, "updates": list(updates.keys())})
         return incident
 
     def add_resource(self, resource: ResourceNode) -> ResourceNode:
         self.graph.resources[resource.id] = resource
-        self.graph.last_updated = datetime.utcnow()
+        self._index_resource(resource)
+        self._mark_changed("resources", resource.id)
         return resource
 
+    def add_resources(self, resources: Iterable[ResourceNode]):
+        """add_resource() for many nodes, marking the graph changed once."""
+        nodes = self.graph.resources
+        ids = []
+        for resource in resources:
+            nodes[resource.id] = resource
+            self._index_resource(resource)
+            ids.append(resource.id)
+        if ids:
+            self._mark_changed("resources", *ids)
+
     def update_resource(self, resource_id: str, updates: dict) -> Optional[ResourceNode]:
         if resource_id not in self.graph.resources:
             return None
@@ -66,17 +280,28 @@ class SituationGraphManager:
             if hasattr(resource, key):
                 setattr(resource, key, value)
         resource.updated_at = datetime.utcnow()
-        self.graph.last_updated = datetime.utcnow()
+        self._index_resource(resource)
+        self._mark_changed("resources", resource_id)
         return resource
 
     def add_location(self, location: LocationNode) -> LocationNode:
         self.graph.locations[location.id] = location
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("locations", location.id)
         return location
 
+    def add_locations(self, locations: Iterable[LocationNode]):
+        """add_location() for many nodes, marking the graph changed once."""
+        nodes = self.graph.locations
+        ids = []
+        for location in locations:
+            nodes[location.id] = location
+            ids.append(location.id)
+        if ids:
+            self._mark_changed("locations", *ids)
+
     def add_contradiction(self, alert: ContradictionAlert) -> ContradictionAlert:
         self.graph.contradictions[alert.id] = alert
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("contradictions", alert.id)
         self._log_event("contradiction_added", {
             "alert_id": alert.id,
             "entity": alert.entity_name,
@@ -92,7 +317,7 @@ class SituationGraphManager:
         alert.resolution = resolution
         alert.resolved_by = resolved_by
         alert.resolved_at = datetime.utcnow()
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("contradictions", alert_id)
         self._log_event("contradiction_resolved", {
             "alert_id": alert_id,
             "resolution": resolution,
@@ -102,7 +327,7 @@ class SituationGraphManager:
 
     def add_action(self, action: ActionRecommendation) -> ActionRecommendation:
         self.graph.pending_actions[action.id] = action
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("pending_actions", action.id)
         self._log_event("action_recommended", {
             "action_id": action.id,
             "action_type": action.action_type,
@@ -117,7 +342,7 @@ class SituationGraphManager:
         action.status = "approved"
         action.decided_at = datetime.utcnow()
         action.decided_by = decided_by
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("pending_actions", action_id)
 
         # Update resources
         for resource_id in action.resources_to_allocate:
@@ -129,6 +354,8 @@ class SituationGraphManager:
                 resource.updated_at = datetime.utcnow()
                 if action.target_location:
                     resource.destination = action.target_location
+                self._index_resource(resource)
+                self._mark_changed("resources", resource_id)
 
         # Update incident status
         if action.target_incident_id and action.target_incident_id in self.graph.incidents:
@@ -136,6 +363,8 @@ class SituationGraphManager:
             incident.status = "responding"
             incident.assigned_resources.extend(action.resources_to_allocate)
             incident.updated_at = datetime.utcnow()
+            self._index_incident(incident)
+            self._mark_changed("incidents", incident.id)
 
         self._log_event("action_approved", {
             "action_id": action_id,
@@ -151,7 +380,7 @@ class SituationGraphManager:
         action.status = "rejected"
         action.decided_at = datetime.utcnow()
         action.decided_by = decided_by
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("pending_actions", action_id)
         self._log_event("action_rejected", {
             "action_id": action_id,
             "reason": reason,
@@ -161,36 +390,90 @@ class SituationGraphManager:
 
     def add_edge(self, edge: GraphEdge) -> GraphEdge:
         self.graph.edges[edge.id] = edge
+        self._mark_changed("edges", edge.id)
         return edge
 
     def get_incidents_by_urgency(self) -> list[IncidentNode]:
-        urgency_order = {Urgency.CRITICAL: 0, Urgency.HIGH: 1, Urgency.MEDIUM: 2, Urgency.LOW: 3}
+        rows = self._incident_rows()
+        active = np.flatnonzero(rows["st"] == INCIDENT_STATUS_CODES["active"])
+        order = active[np.argsort(rows["urg"][active], kind="stable")]
+        incidents, ids = self.graph.incidents, self._inc_ids
+        return [incidents[ids[i]] for i in order]
+
+    def get_active_incidents(self) -> list[IncidentNode]:
+        """Active incidents in insertion order."""
+        active = np.flatnonzero(self._incident_rows()["st"] == INCIDENT_STATUS_CODES["active"])
+        incidents, ids = self.graph.incidents, self._inc_ids
+        return [incidents[ids[i]] for i in active]
+
+    def get_unaddressed_critical_incidents(self) -> list[IncidentNode]:
+        """Active critical/high incidents with no resources assigned, in insertion order."""
+        ids = sorted(self.active_critical_incidents & self.unassigned_incidents, key=self._inc_index.__getitem__)
+        incidents = self.graph.incidents
+        return [incidents[i] for i in ids]
+
+    def incident_context(self, incident: IncidentNode) -> dict:
+        """Incident summary fed to the planning/allocation prompts (cached on the node)."""
+        ctx = incident._ctx_dict
+        if ctx is None:
+            ctx = incident._ctx_dict = {
+                "id": incident.id,
+                "incident_type": incident.incident_type,
+                "sector": incident.location.sector or "unknown",
+                "urgency": incident.urgency.value,
+                "confidence": incident.confidence,
+                "trapped_min": incident.trapped_min,
+                "trapped_max": incident.trapped_max,
+                "status": incident.status,
+                "lat": incident.location.lat,
+                "lng": incident.location.lng
+            }
+        return ctx
+
+    def get_pending_actions(self) -> list[ActionRecommendation]:
+        """Pending actions, most time-sensitive first, then by decision deadline."""
         return sorted(
-            [i for i in self.graph.incidents.values() if i.status == "active"],
-            key=lambda x: urgency_order.get(x.urgency, 4)
+            [a for a in self.graph.pending_actions.values() if a.status == "pending"],
+            key=lambda a: (a.time_sensitivity_rank, a.decision_deadline)
         )
 
+    def get_hospital_capacity(self, by_name: bool = False) -> dict[str, str]:
+        """Hospital beds as "used/total" keyed by location id (or name), cached per locations_version."""
+        cached = self._hospital_capacity.get(by_name)
+        if cached is not None and cached[0] == self.locations_version:
+            return cached[1]
+        capacity = {}
+        for loc in self.graph.locations.values():
+            if loc.location_type == "hospital" and loc.capacity_total:
+                key = (loc.location.name or loc.id) if by_name else loc.id
+                capacity[key] = f"{loc.capacity_used or 0}/{loc.capacity_total}"
+        self._hospital_capacity[by_name] = (self.locations_version, capacity)
+        return capacity
+
     def get_available_resources(self, resource_type: Optional[str] = None) -> list[ResourceNode]:
-        resources = [r for r in self.graph.resources.values() if r.status == "available"]
+        ids = [rid for sector_ids in self.available_resources_by_sector.values() for rid in sector_ids]
+        ids.sort(key=self._res_seq.__getitem__)
+        all_resources = self.graph.resources
+        resources = [all_resources[rid] for rid in ids]
         if resource_type:
             resources = [r for r in resources if r.resource_type == resource_type]
         return resources
 
     def find_related_incidents(self, location: Location, radius_km: float = 1.0) -> list[IncidentNode]:
         """Find incidents near a given location."""
-        import math
-        result = []
-        for incident in self.graph.incidents.values():
-            dist = self._haversine(location.lat, location.lng,
-                                   incident.location.lat, incident.location.lng)
-            if dist <= radius_km:
-                result.append(incident)
-        return result
+        rows = self._incident_rows()
+        lat1, lon1 = math.radians(location.lat), math.radians(location.lng)
+        lat2, lon2 = np.radians(rows["lat"]), np.radians(rows["lng"])
+        a = (np.sin((lat2 - lat1) / 2) ** 2
+             + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+        # Compare the haversine term directly instead of converting every row to km
+        max_a = math.sin(min(radius_km / (2 * 6371), math.pi / 2)) ** 2
+        incidents, ids = self.graph.incidents, self._inc_ids
+        return [incidents[ids[i]] for i in np.flatnonzero(a <= max_a)]
 
     @staticmethod
     def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """Calculate distance between two points in km."""
-        import math
         R = 6371
         phi1, phi2 = math.radians(lat1), math.radians(lat2)
         dphi = math.radians(lat2 - lat1)
@@ -198,63 +481,216 @@ class SituationGraphManager:
         a = math.sin(dphi/2)**2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda/2)**2
         return 2 * R * math.asin(math.sqrt(a))
 
-    def get_decision_audit(self, decision_id: str) -> dict:
+    async def get_decision_audit(self, decision_id: str) -> dict:
         """Get full audit trail for a decision."""
-        events = [e for e in self.audit_log if decision_id in str(e)]
+        in_memory = [e for e in self.audit_log if decision_id in str(e)]
+        events = await self._spilled_audit(decision_id) + in_memory
         action = self.graph.pending_actions.get(decision_id)
         contradiction = self.graph.contradictions.get(decision_id)
 
         return {
             "decision_id": decision_id,
-            "action": action.model_dump() if action else None,
-            "contradiction": contradiction.model_dump() if contradiction else None,
+            "action": self._dump(action, action.decided_at) if action else None,
+            "contradiction": self._dump(contradiction, contradiction.resolved_at) if contradiction else None,
             "audit_events": events
         }
 
-    def get_incident_audit(self, incident_id: str) -> dict:
+    async def get_incident_audit(self, incident_id: str) -> dict:
         """Get all data related to an incident."""
         incident = self.graph.incidents.get(incident_id)
         if not incident:
             return {"error": "Incident not found"}
 
         related_actions = [
-            a.model_dump() for a in self.graph.pending_actions.values()
+            self._dump(a, a.decided_at) for a in self.graph.pending_actions.values()
             if a.target_incident_id == incident_id
         ]
 
+        in_memory = list(self.audit_log)
+        events = await self._spilled_audit(incident_id) + in_memory
         return {
-            "incident": incident.model_dump(),
+            "incident": self._dump(incident, incident.updated_at),
             "related_actions": related_actions,
-            "audit_events": [e for e in self.audit_log
+            "audit_events": [e for e in events
                              if e.get("data", {}).get("incident_id") == incident_id]
         }
 
+    def _dump(self, node, stamp: Optional[datetime]) -> dict:
+        """model_dump() of a node, reused while its stamp (updated_at/decided_at) is unchanged.
+
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        cached = self._dump_cache.get(node.id)
+        if cached is not None and cached[0] == stamp:
+            self._dump_cache.move_to_end(node.id)
+            return cached[1]
+        dumped = node.model_dump()
+        self._dump_cache[node.id] = (stamp, dumped)
+        self._dump_cache.move_to_end(node.id)
+        if len(self._dump_cache) > DUMP_CACHE_SIZE:
+            self._dump_cache.popitem(last=False)
+        return dumped
+
     def _log_event(self, event_type: str, data: dict):
+        if self.audit_spill_path and len(self.audit_log) == self.audit_log.maxlen:
+            self._spill_audit_log()
         self.audit_log.append({
             "timestamp": datetime.utcnow().isoformat(),
             "event_type": event_type,
             "data": data
         })
 
-    def decay_confidences(self, elapsed_minutes: float):
-        """Decay confidence values over time."""
-        for incident in self.graph.incidents.values():
-            if incident.status == "active":
-                decay = incident.decay_rate * elapsed_minutes
-                incident.confidence = max(0.1, incident.confidence - decay)
-        self.graph.last_updated = datetime.utcnow()
+    async def _spilled_audit(self, *ids: str) -> list[dict]:
+        """_scan_spilled_audit on the audit I/O thread, queued behind any pending spill writes.
+
+        Callers copy audit_log before awaiting this, so each event is seen exactly once.
+        """
+        if self._audit_io is None or not ids:
+            return []
+        return await asyncio.get_running_loop().run_in_executor(self._audit_io, self._scan_spilled_audit, *ids)
+
+    def _scan_spilled_audit(self, *ids: str) -> list[dict]:
+        """Spilled audit events whose raw ndjson line mentions any of the given ids.
+
+        One compiled multi-pattern regex runs over the memory-mapped file, so only
+        matching lines are decoded.
+        """
+        path = self.audit_spill_path
+        if not path or not ids or not os.path.exists(path) or os.path.getsize(path) == 0:
+            return []
+        pattern = re.compile(b"|".join(re.escape(i.encode()) for i in ids))
+        events = []
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = 0
+            while (match := pattern.search(mm, pos)) is not None:
+                start = mm.rfind(b"\n", 0, match.start()) + 1
+                end = mm.find(b"\n", match.end())
+                if end == -1:
+                    end = len(mm)
+                try:
+                    events.append(json.loads(mm[start:end]))
+                except ValueError:
+                    pass
+                pos = end + 1
+        return events
+
+    def _spill_audit_log(self):
+        """Move the oldest batch of audit events from memory to the ndjson spill file (in the background)."""
+        popleft = self.audit_log.popleft
+        batch = [popleft() for _ in range(min(AUDIT_SPILL_BATCH, len(self.audit_log)))]
+        self._audit_io.submit(self._write_audit_batch, self.audit_spill_path, batch)
+
+    @staticmethod
+    def _write_audit_batch(path: str, batch: list[dict]):
+        try:
+            with open(path, "a", encoding="utf-8") as f:
+                f.writelines(json.dumps(e, default=str) + "\n" for e in batch)
+        except OSError as e:
+            logger.warning("Failed to spill %d audit events: %s", len(batch), e)
+
+    def _clear_audit_spill(self):
+        """Empty the spill file once queued writes finish; it only holds events from this graph."""
+        if self._audit_io is not None:
+            self._audit_io.submit(self._truncate_audit_spill, self.audit_spill_path)
+
+    @staticmethod
+    def _truncate_audit_spill(path: str):
+        try:
+            open(path, "w").close()
+        except OSError as e:
+            logger.warning("Failed to clear audit spill file %s: %s", path, e)
+
+    def decay_confidences(self, elapsed_minutes: float) -> int:
+        """Decay confidence values over time; returns the number of incidents changed.
+
+        Runs as one vector op over the incident table; the nodes pick up the new
+        values lazily the next time the graph is read (see the graph property).
+        """
+        rows = self._incident_rows()
+        conf = rows["conf"]
+        decayed = conf - rows["decay"] * elapsed_minutes
+        np.maximum(decayed, 0.1, out=decayed)
+        changed = np.flatnonzero((rows["st"] == INCIDENT_STATUS_CODES["active"]) & (decayed != conf))
+        if not changed.size:
+            return 0
+        conf[changed] = decayed[changed]
+        self._stale_conf_rows.update(changed.tolist())
+        self._mark_changed()
+        return int(changed.size)
+
+    # ============== INCIDENT TABLE ==============
+
+    def _incident_rows(self) -> np.ndarray:
+        """View of the populated incident table rows."""
+        return self._incidents_arr[:len(self._inc_ids)]
+
+    def _flush_confidences(self):
+        """Write decayed confidences from the incident table back to the nodes."""
+        incidents, ids = self._graph.incidents, self._inc_ids
+        rows = list(self._stale_conf_rows)
+        # One gather + tolist() instead of a numpy scalar per row
+        for i, value in zip(rows, self._incidents_arr["conf"][rows].tolist()):
+            incident = incidents[ids[i]]
+            # Bypass pydantic __setattr__: the value is always a float
+            incident.__dict__["confidence"] = value
+            incident._ctx_dict = None
+            incident._cached_json = None
+            self._dump_cache.pop(ids[i], None)
+            self._touched.add(("incidents", ids[i]))
+        self._stale_conf_rows.clear()
+        self._snapshot_json = None
+
+    def _index_incident(self, incident: IncidentNode):
+        """Write an incident's numeric fields into its table row, allocating one if new."""
+        row = self._inc_index.get(incident.id)
+        if row is None:
+            row = len(self._inc_ids)
+            if row == len(self._incidents_arr):
+                grown = np.zeros(2 * row, dtype=INCIDENT_ROW_DTYPE)
+                grown[:row] = self._incidents_arr
+                self._incidents_arr = grown
+            self._inc_index[incident.id] = row
+            self._inc_ids.append(incident.id)
+        self._incidents_arr[row] = (
+            incident.location.lat, incident.location.lng,
+            URGENCY_RANK.get(incident.urgency, 4), INCIDENT_STATUS_CODES[incident.status],
+            incident.confidence, incident.decay_rate,
+        )
+        if incident.status == "active" and incident.urgency in CRITICAL_URGENCIES:
+            self.active_critical_incidents.add(incident.id)
+        else:
+            self.active_critical_incidents.discard(incident.id)
+        if incident.assigned_resources:
+            self.unassigned_incidents.discard(incident.id)
+        else:
+            self.unassigned_incidents.add(incident.id)
+        incident._ctx_dict = None
+
+    def _index_resource(self, resource: ResourceNode):
+        """Keep available_resources_by_sector in sync with a resource's status and sector."""
+        self._res_seq.setdefault(resource.id, len(self._res_seq))
+        old_sector = self._available_sector.pop(resource.id, None)
+        if old_sector is not None:
+            sector_ids = self.available_resources_by_sector[old_sector]
+            sector_ids.discard(resource.id)
+            if not sector_ids:
+                del self.available_resources_by_sector[old_sector]
+        if resource.status == "available":
+            sector = resource.current_location.sector or "unknown"
+            self.available_resources_by_sector.setdefault(sector, set()).add(resource.id)
+            self._available_sector[resource.id] = sector
 
     # ============== ALLOCATION & CAMPS ==============
 
     def add_allocation_plan(self, plan: AllocationPlan) -> AllocationPlan:
         self.graph.allocation_plans[plan.id] = plan
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("allocation_plans", plan.id)
         self._log_event("allocation_plan_created", {"plan_id": plan.id})
         return plan
 
     def add_camp(self, camp: CampRecommendation) -> CampRecommendation:
         self.graph.camp_locations[camp.id] = camp
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("camp_locations", camp.id)
         self._log_event("camp_added", {"camp_id": camp.id, "type": camp.camp_type})
         return camp
 
@@ -264,7 +700,7 @@ class SituationGraphManager:
         camp = self.graph.camp_locations[camp_id]
         camp.status = "active"
         camp.decided_at = datetime.utcnow()
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("camp_locations", camp_id)
         self._log_event("camp_approved", {"camp_id": camp_id})
         return camp
 
@@ -274,7 +710,7 @@ class SituationGraphManager:
         camp = self.graph.camp_locations[camp_id]
         camp.status = "rejected"
         camp.decided_at = datetime.utcnow()
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("camp_locations", camp_id)
         self._log_event("camp_rejected", {"camp_id": camp_id})
         return camp
 
@@ -292,7 +728,10 @@ class SituationGraphManager:
         if resource_id not in incident.assigned_resources:
             incident.assigned_resources.append(resource_id)
         incident.updated_at = datetime.utcnow()
-        self.graph.last_updated = datetime.utcnow()
+        self._index_resource(resource)
+        self._index_incident(incident)
+        self._mark_changed("resources", resource_id)
+        self._mark_changed("incidents", incident_id)
         self._log_event("resource_assigned", {"resource_id": resource_id, "incident_id": incident_id})
         return resource
 
@@ -310,23 +749,28 @@ class SituationGraphManager:
             incident = self.graph.incidents[old_incident_id]
             if resource_id in incident.assigned_resources:
                 incident.assigned_resources.remove(resource_id)
-        self.graph.last_updated = datetime.utcnow()
+                incident.updated_at = datetime.utcnow()
+                self._index_incident(incident)
+                self._mark_changed("incidents", old_incident_id)
+        self._index_resource(resource)
+        self._mark_changed("resources", resource_id)
         self._log_event("resource_unassigned", {"resource_id": resource_id})
         return resource
 
     def add_voice_report(self, report: VoiceReport) -> VoiceReport:
         self.graph.voice_reports[report.id] = report
-        self.graph.last_updated = datetime.utcnow()
+        self._mark_changed("voice_reports", report.id)
         self._log_event("voice_report_added", {"report_id": report.id})
         return report
 
     def get_stats(self) -> dict:
         incidents = self.graph.incidents
         resources = self.graph.resources
+        status_counts = np.bincount(self._incident_rows()["st"], minlength=len(INCIDENT_STATUS_CODES))
         return {
             "total_incidents": len(incidents),
-            "active_incidents": len([i for i in incidents.values() if i.status == "active"]),
-            "responding_incidents": len([i for i in incidents.values() if i.status == "responding"]),
+            "active_incidents": int(status_counts[INCIDENT_STATUS_CODES["active"]]),
+            "responding_incidents": int(status_counts[INCIDENT_STATUS_CODES["responding"]]),
             "resources_available": len([r for r in resources.values() if r.status == "available"]),
             "resources_deployed": len([r for r in resources.values() if r.status in ["dispatched", "on_scene"]]),
             "pending_contradictions": len([c for c in self.graph.contradictions.values() if not c.resolved]),
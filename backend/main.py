@@ -1,7 +1,11 @@
 """
 CrisisCore FastAPI Application
 """
+import asyncio
+import logging
+import logging.handlers
 import os
+import queue
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -16,18 +20,38 @@ from api.websocket import websocket_endpoint
 from orchestrator.coordinator import Coordinator
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
 
 # Global coordinator instance
 _coordinator: Coordinator = None
 
 
+def _start_logging(level: str) -> logging.handlers.QueueListener:
+    """Route app logs through a queue so formatting and stream writes happen off the event loop."""
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(level.upper())
+    listener.start()
+    return listener
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     global _coordinator
+    log_listener = _start_logging(settings.log_level)
+    # uvloop when started with --loop uvloop (or auto with uvloop installed)
+    loop = asyncio.get_running_loop()
+    logger.info("Event loop: %s.%s", type(loop).__module__, type(loop).__name__)
     _coordinator = Coordinator()
     await _coordinator.initialize()
     yield
     await _coordinator.shutdown()
+    log_listener.stop()
 
 
 app = FastAPI(
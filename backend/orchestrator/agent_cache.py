@@ -0,0 +1,50 @@
+"""
+Exact-match cache for the signal-analysis agents.
+
+Outputs are keyed by a SHA-256 of the prompt the agent would send (agent,
+model and formatted messages), so a hit is only ever reused for a request
+Gemini would see as identical. Demo fallbacks are never cached.
+"""
+import hashlib
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any
+
+import orjson
+
+from agents.base_agent import AgentOutput, BaseAgent
+
+CACHE_SIZE = 256
+
+
+class AgentOutputCache:
+    def __init__(self, max_size: int = CACHE_SIZE):
+        self.max_size = max_size
+        # prompt key -> output, LRU order
+        self._entries: OrderedDict[str, AgentOutput] = OrderedDict()
+
+    async def get_or_compute(self, agent: BaseAgent, raw_input: Any) -> AgentOutput:
+        """Return a cached output for this exact prompt, or run the agent and cache a real answer."""
+        key = self._key(agent, raw_input)
+        hit = self._entries.get(key)
+        if hit is not None:
+            self._entries.move_to_end(key)
+            return hit.model_copy(deep=True, update={"timestamp": datetime.utcnow()})
+
+        output = await agent.process(raw_input)
+        if not output.fallback:
+            self._put(key, output)
+        return output
+
+    @staticmethod
+    def _key(agent: BaseAgent, raw_input: Any) -> str:
+        prompt = orjson.dumps(agent.format_input(raw_input), default=str)
+        return hashlib.sha256(
+            b"\x1f".join((agent.agent_name.encode(), agent.model_name.encode(), prompt))
+        ).hexdigest()
+
+    def _put(self, key: str, output: AgentOutput):
+        self._entries[key] = output
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
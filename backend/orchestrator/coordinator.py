@@ -2,8 +2,14 @@
 Main orchestrator - coordinates all agents and manages the situation graph.
 """
 import asyncio
-import uuid
+import logging
+import secrets
+import struct
+import time
+from collections import deque
 from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import count, islice
 from typing import Optional
 
 import google.generativeai as genai
@@ -13,9 +19,11 @@ from graph.schemas import (
     SituationGraph, IncidentNode, ResourceNode, LocationNode,
     ContradictionAlert, ActionRecommendation,
     DamageLevel, Urgency, ActionType, Verdict,
-    Location, SourceReference, SourceType, HumanDecision
+    Location, SourceReference, SourceType, HumanDecision, URGENCY_RANK, entity_id_for
 )
 from graph.situation_graph import SituationGraphManager
+from graph.encoding import dumps, dumps_node
+from orchestrator.agent_cache import AgentOutputCache
 from agents.vision_agent import VisionAgent
 from agents.audio_agent import AudioAgent
 from agents.text_agent import TextAgent
@@ -25,14 +33,86 @@ from agents.temporal_agent import TemporalAgent
 from agents.debate_agent import DebateAgent
 from agents.allocation_agent import AllocationAgent
 
+logger = logging.getLogger(__name__)
+
+# Events kept for the timeline feed
+RECENT_EVENTS_LIMIT = 50
+
+# Verification agent calls allowed in flight at once
+VERIFICATION_CONCURRENCY = 4
+
+
+def _short_id(nbytes: int = 4) -> str:
+    """Short random hex id (8 chars by default) for signals, alerts, actions, plans."""
+    return secrets.token_hex(nbytes)
+
+
+# Timeline event ids only need to be unique within the process
+_event_ids = count(1)
+
+
+@lru_cache(maxsize=1)
+def _utc_iso_second(epoch_second: int) -> str:
+    """ISO timestamp for a whole UTC second, reused for every event in that second."""
+    return datetime.utcfromtimestamp(epoch_second).isoformat()
+
+
+# ============== AGENT OUTPUT MAPPINGS ==============
+
+_URGENCY_FROM_STR = {
+    "critical": Urgency.CRITICAL,
+    "high": Urgency.HIGH,
+    "medium": Urgency.MEDIUM,
+    "low": Urgency.LOW
+}
+# Checked in order by _parse_urgency, so the most severe level mentioned wins
+_URGENCY_LEVELS = ("critical", "high", "medium", "low")
+
+_DAMAGE_TO_URGENCY = {
+    DamageLevel.CATASTROPHIC: Urgency.CRITICAL,
+    DamageLevel.SEVERE: Urgency.CRITICAL,
+    DamageLevel.MODERATE: Urgency.HIGH,
+    DamageLevel.MINOR: Urgency.MEDIUM,
+    DamageLevel.NONE: Urgency.LOW
+}
+
 
 def _parse_urgency(raw: str) -> Urgency:
     """Extract a valid Urgency enum from a potentially verbose string like 'critical — some explanation'."""
-    raw = str(raw).lower()
-    for level in ("critical", "high", "medium", "low"):
-        if level in raw:
-            return Urgency(level)
-    return Urgency.HIGH
+    # Model output may not be a str (or even hashable); normalise before the cached lookup
+    return _urgency_from_str(str(raw))
+
+
+@lru_cache(maxsize=256)
+def _urgency_from_str(raw: str) -> Urgency:
+    raw = raw.casefold()
+    return next((_URGENCY_FROM_STR[level] for level in _URGENCY_LEVELS if level in raw), Urgency.HIGH)
+
+
+def _unit_score(raw, default: float) -> float:
+    """A model-reported confidence clamped to [0, 1]; default if it isn't a number."""
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return default
+    return min(1.0, max(0.0, value)) if value == value else default
+
+
+def _opt_int(raw) -> Optional[int]:
+    """A model-reported count as int, or None if missing or not a number."""
+    try:
+        return int(raw) if raw is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=32)
+def _damage_from_str(raw: str) -> DamageLevel:
+    """DamageLevel for a model-reported string, MODERATE if unrecognised."""
+    try:
+        return DamageLevel(raw)
+    except ValueError:
+        return DamageLevel.MODERATE
 
 
 class Coordinator:
@@ -49,26 +129,39 @@ class Coordinator:
         self.planning_agent = PlanningAgent()
         self.temporal_agent = TemporalAgent()
         self.allocation_agent = AllocationAgent()
+        self.debate_agent = DebateAgent()
+
+        # Agent output cache for repeated signals
+        self._agent_cache = AgentOutputCache()
 
         # Graph manager
-        self.graph_manager = SituationGraphManager()
+        self.graph_manager = SituationGraphManager(
+            audit_spill_path=settings.audit_spill_path or None
+        )
 
         # Signal tracking for contradiction detection
         self.signal_claims: dict[str, list[dict]] = {}  # entity_name -> list of claims
         self.handled_contradictions: set[str] = set()  # entity_names that already have alerts
+        self._pending_verification: set[str] = set()  # entity_names with new claims to verify
+        self._verification_sem = asyncio.Semaphore(VERIFICATION_CONCURRENCY)
 
         # Simulation state
         self.simulation_running = False
         self.simulation_task: Optional[asyncio.Task] = None
         self.simulation_paused = False
 
-        # Recent events for timeline
-        self.recent_events: list[dict] = []
+        # Recent events for timeline (the deque drops the oldest entry once full)
+        self.recent_events: deque[dict] = deque(maxlen=RECENT_EVENTS_LIMIT)
 
         # Planning cooldown — avoid firing the planning agent on every single signal
         self._last_planning_call: Optional[datetime] = None
+        self._planning_inflight: Optional[asyncio.Task] = None
         self._planning_cooldown_seconds: int = 20
 
+        # Fire-and-forget work (contradiction checks, planning); awaited on shutdown
+        self._bg_tasks: set[asyncio.Task] = set()
+        self._followup_lock = asyncio.Lock()
+
     @property
     def graph(self) -> SituationGraph:
         return self.graph_manager.graph
@@ -81,42 +174,44 @@ class Coordinator:
         """Called on shutdown."""
         if self.simulation_task:
             self.simulation_task.cancel()
+        if self._bg_tasks:
+            await asyncio.gather(*self._bg_tasks, return_exceptions=True)
 
     async def process_signal(self, signal_type: str, content: str, metadata: dict) -> dict:
         """Route signal to appropriate agent and update graph."""
-        from api.websocket import broadcast
+        from api.websocket import broadcast_many
 
-        signal_id = str(uuid.uuid4())[:8]
+        signal_id = _short_id()
+        # One timestamp for every node and event this signal produces
+        now = datetime.utcnow()
 
         # Add timeline event
         self._add_event(f"signal_{signal_type}", {
             "signal_id": signal_id,
             "type": signal_type,
             "metadata": metadata
-        })
+        }, timestamp=now.isoformat())
+
+        # Client messages for this signal, sent as one batch at the end
+        events: list[tuple[str, dict]] = []
 
         try:
-            # Select agent and process
+            # Select agent and process (repeated signals are served from cache)
             if signal_type == "image":
-                agent_output = await self.vision_agent.process({
-                    "content": content,
-                    "metadata": metadata
-                })
+                agent = self.vision_agent
             elif signal_type == "audio":
-                agent_output = await self.audio_agent.process({
-                    "content": content,
-                    "metadata": metadata
-                })
+                agent = self.audio_agent
             elif signal_type == "text":
-                agent_output = await self.text_agent.process({
-                    "content": content,
-                    "metadata": metadata
-                })
+                agent = self.text_agent
             else:
                 raise ValueError(f"Unknown signal type: {signal_type}")
+            agent_output = await self._agent_cache.get_or_compute(agent, {
+                "content": content,
+                "metadata": metadata
+            })
 
-            # Broadcast signal processing result
-            await broadcast("signal_processed", {
+            # Signal processing result
+            events.append(("signal_processed", {
                 "signal_id": signal_id,
                 "signal_type": signal_type,
                 "agent_name": agent_output.agent_name,
@@ -126,25 +221,24 @@ class Coordinator:
                 "reasoning": agent_output.reasoning,
                 "timestamp": agent_output.timestamp.isoformat(),
                 "metadata": metadata
-            })
+            }))
 
             # Update graph
             incident = await self._update_graph_from_output(
-                agent_output, signal_type, signal_id, metadata
+                agent_output, signal_type, signal_id, metadata, events, now=now
             )
 
-            # Check contradictions (skip during simulation — scripted injections handle this)
-            if incident and not self.simulation_running:
-                await self._check_contradictions(agent_output, incident, signal_id)
+            # Contradiction checks and planning don't feed the response — run them in the background
+            self._spawn(self._run_followups(agent_output, incident, signal_id))
 
-            # Maybe generate recommendations
-            await self._maybe_generate_recommendations()
-
-            # Broadcast update
-            await broadcast("graph_update", self.graph_manager.graph.model_dump(mode="json"))
-            await broadcast("timeline_event", {
-                "events": self.recent_events[-10:]
-            })
+            # Broadcast everything in one frame
+            patch = self.graph_manager.take_patch()
+            if patch:
+                events.append(("graph_patch", patch))
+            events.append(("timeline_event", {
+                "events": self.recent_events_tail(10)
+            }))
+            await broadcast_many(events)
 
             return {
                 "signal_id": signal_id,
@@ -155,13 +249,52 @@ class Coordinator:
             }
 
         except Exception as e:
-            print(f"Error processing signal: {e}")
+            logger.error("Error processing signal: %s", e)
+            # Still deliver whatever was produced before the failure
+            await broadcast_many(events)
             return {"error": str(e), "signal_id": signal_id}
 
-    async def _update_graph_from_output(self, output, signal_type: str, signal_id: str, metadata: dict):
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background; shutdown() waits for it."""
+        task = asyncio.create_task(coro)
+        self._bg_tasks.add(task)
+        task.add_done_callback(self._bg_tasks.discard)
+        return task
+
+    async def _run_followups(self, agent_output, incident: Optional[IncidentNode], signal_id: str):
+        """Contradiction check for a processed signal (broadcast as one batch), then maybe start planning.
+
+        This can queue behind earlier signals' follow-ups, so anything it creates
+        is stamped when created rather than with the signal's arrival time.
+        """
+        from api.websocket import broadcast_many
+
+        events: list[tuple[str, dict]] = []
+        # One follow-up at a time so concurrent signals don't verify the same entity twice
+        async with self._followup_lock:
+            try:
+                # Check contradictions (skip during simulation — scripted injections handle this)
+                if incident and not self.simulation_running:
+                    await self._check_contradictions(agent_output, incident, signal_id, events)
+
+                # Maybe kick off a planning run (broadcasts on its own)
+                self._maybe_generate_recommendations(now=datetime.utcnow())
+            except Exception as e:
+                logger.error("Error in signal follow-up for %s: %s", signal_id, e)
+
+            if events:
+                patch = self.graph_manager.take_patch()
+                if patch:
+                    events.append(("graph_patch", patch))
+                events.append(("timeline_event", {
+                    "events": self.recent_events_tail(10)
+                }))
+            await broadcast_many(events)
+
+    async def _update_graph_from_output(self, output, signal_type: str, signal_id: str, metadata: dict,
+                                        events: list[tuple[str, dict]], *, now: datetime):
         """Update situation graph based on agent output."""
         data = output.data
-        now = datetime.utcnow()
 
         # Build source reference
         source_ref = SourceReference(
@@ -174,9 +307,16 @@ class Coordinator:
 
         # Parse location from metadata
         loc_data = metadata.get("location", {}) or {}
+        if "lat" in loc_data and "lng" in loc_data:
+            lat, lng = loc_data["lat"], loc_data["lng"]
+        else:
+            # No coordinates reported: place it near the city centre, derived from the signal id
+            a, b = struct.unpack("<HH", signal_id.encode()[:4].ljust(4, b"\x00"))
+            lat = loc_data.get("lat", 37.78 + (a % 100) * 0.001)
+            lng = loc_data.get("lng", -122.41 + (b % 100) * 0.001)
         location = Location(
-            lat=loc_data.get("lat", 37.78 + (hash(signal_id) % 100) * 0.001),
-            lng=loc_data.get("lng", -122.41 + (hash(signal_id[::-1]) % 100) * 0.001),
+            lat=lat,
+            lng=lng,
             sector=metadata.get("sector", "1"),
             name=metadata.get("location_name")
         )
@@ -184,193 +324,175 @@ class Coordinator:
         incident = None
 
         if signal_type == "image":
-            damage_level_str = data.get("damage_level", "moderate")
-            try:
-                damage_level = DamageLevel(damage_level_str)
-            except ValueError:
-                damage_level = DamageLevel.MODERATE
+            damage_level = _damage_from_str(str(data.get("damage_level", "moderate")))
 
             # Map damage level to urgency
-            urgency_map = {
-                DamageLevel.CATASTROPHIC: Urgency.CRITICAL,
-                DamageLevel.SEVERE: Urgency.CRITICAL,
-                DamageLevel.MODERATE: Urgency.HIGH,
-                DamageLevel.MINOR: Urgency.MEDIUM,
-                DamageLevel.NONE: Urgency.LOW
-            }
-            urgency = urgency_map.get(damage_level, Urgency.MEDIUM)
+            urgency = _DAMAGE_TO_URGENCY.get(damage_level, Urgency.MEDIUM)
 
             casualties = data.get("estimated_casualties") or {}
             incident_id = f"inc_{signal_id}"
 
-            incident = IncidentNode(
+            # Every field is built or coerced here, so skip re-validation
+            incident = IncidentNode.model_construct(
                 id=incident_id,
                 incident_type="structural_collapse" if "structural_collapse" in (data.get("damage_types") or []) else "damage",
                 location=location,
                 damage_level=damage_level,
                 urgency=urgency,
-                trapped_min=casualties.get("min"),
-                trapped_max=casualties.get("max"),
-                confidence=data.get("overall_confidence", 0.5),
+                trapped_min=_opt_int(casualties.get("min")),
+                trapped_max=_opt_int(casualties.get("max")),
+                confidence=_unit_score(data.get("overall_confidence", 0.5), 0.5),
                 sources=[source_ref],
                 created_at=now,
                 updated_at=now
             )
             self.graph_manager.add_incident(incident)
-            await self._broadcast_incident(incident)
+            events.append(("new_incident", dumps_node(incident)))
 
         elif signal_type == "audio":
-            urgency_map = {
-                "critical": Urgency.CRITICAL,
-                "high": Urgency.HIGH,
-                "medium": Urgency.MEDIUM,
-                "low": Urgency.LOW
-            }
-            urgency = urgency_map.get(data.get("urgency", "high"), Urgency.HIGH)
+            urgency = _URGENCY_FROM_STR.get(data.get("urgency", "high"), Urgency.HIGH)
 
             persons = data.get("persons_involved") or {}
             trapped = persons.get("trapped", {}) if isinstance(persons.get("trapped"), dict) else {}
             incident_id = f"inc_{signal_id}"
 
-            incident = IncidentNode(
+            incident = IncidentNode.model_construct(
                 id=incident_id,
-                incident_type=data.get("incident_type", "emergency"),
+                incident_type=str(data.get("incident_type") or "emergency"),
                 location=location,
                 damage_level=DamageLevel.SEVERE if urgency == Urgency.CRITICAL else DamageLevel.MODERATE,
                 urgency=urgency,
-                trapped_min=trapped.get("min") if isinstance(trapped, dict) else None,
-                trapped_max=trapped.get("max") if isinstance(trapped, dict) else None,
-                confidence=data.get("overall_confidence", 0.5),
+                trapped_min=_opt_int(trapped.get("min")),
+                trapped_max=_opt_int(trapped.get("max")),
+                confidence=_unit_score(data.get("overall_confidence", 0.5), 0.5),
                 sources=[source_ref],
                 created_at=now,
                 updated_at=now
             )
             self.graph_manager.add_incident(incident)
-            await self._broadcast_incident(incident)
+            events.append(("new_incident", dumps_node(incident)))
 
         elif signal_type == "text":
             # Only accumulate claims for contradiction detection outside of simulation
             if not self.simulation_running:
-                claims = data.get("claims") or []
-                for claim_data in claims:
-                    entity_name = claim_data.get("location", {}).get("name", "") if isinstance(claim_data.get("location"), dict) else ""
-                    if entity_name:
-                        if entity_name in self.handled_contradictions:
-                            continue
-                        if entity_name not in self.signal_claims:
-                            self.signal_claims[entity_name] = []
-                        self.signal_claims[entity_name].append({
-                            "source": f"text_{signal_id}",
-                            "source_type": data.get("source_type", "unverified"),
+                signal_claims = self.signal_claims
+                handled = self.handled_contradictions
+                pending = self._pending_verification
+                source = f"text_{signal_id}"
+                source_type = data.get("source_type", "unverified")
+                timestamp = now.strftime("%H:%M")
+                for claim_data in data.get("claims") or []:
+                    loc = claim_data.get("location")
+                    entity_name = loc.get("name", "") if isinstance(loc, dict) else ""
+                    if entity_name and entity_name not in handled:
+                        claims = signal_claims.setdefault(entity_name, [])
+                        claims.append({
+                            "source": source,
+                            "source_type": source_type,
                             "claim": claim_data.get("claim", ""),
                             "confidence": claim_data.get("confidence", 0.4),
-                            "timestamp": now.strftime("%H:%M")
+                            "timestamp": timestamp
                         })
+                        if len(claims) >= 2:
+                            pending.add(entity_name)
 
         return incident
 
-    async def _check_contradictions(self, new_output, incident: IncidentNode, signal_id: str):
+    async def _check_contradictions(self, new_output, incident: IncidentNode, signal_id: str,
+                                    events: list[tuple[str, dict]]):
         """Check if new output contradicts existing data."""
-        from api.websocket import broadcast
+        # Only entities that gained a claim since the last check can have changed
+        pending = self._pending_verification
+        eligible = []
+        for entity_name in pending:
+            claims = self.signal_claims.get(entity_name)
+            # Skip if entity was already processed/deleted, or already has an alert
+            if claims is None or entity_name in self.handled_contradictions:
+                continue
+            if len(claims) >= 2:
+                eligible.append((entity_name, claims))
+        pending.clear()
+        if not eligible:
+            return
 
-        # Check claims for contradictions (iterate over copy to allow deletion)
-        for entity_name, claims in list(self.signal_claims.items()):
-            # Skip if entity was already processed/deleted by another process
-            if entity_name not in self.signal_claims:
+        # Verify entities concurrently, then commit alerts one at a time
+        results = await asyncio.gather(
+            *(self._verify_one(entity_name, claims) for entity_name, claims in eligible),
+            return_exceptions=True
+        )
+        for (entity_name, claims), result in zip(eligible, results):
+            if isinstance(result, BaseException):
+                logger.error("Error in contradiction check for '%s': %s", entity_name, result, exc_info=result)
+                # Clean up claims on error to prevent repeated processing
+                self.signal_claims.pop(entity_name, None)
                 continue
-            # Skip if entity already has a contradiction alert
-            if entity_name in self.handled_contradictions:
+            if result is None:
                 continue
-            if len(claims) >= 2:
-                # Run verification agent
-                verification_input = {
-                    "entity": entity_name,
-                    "entity_type": "infrastructure",
-                    "claims": claims
-                }
+            ver_data = result
+            alert_id = f"alert_{_short_id()}"
+
+            alert = ContradictionAlert(
+                id=alert_id,
+                entity_id=entity_id_for(entity_name),
+                entity_type=ver_data.get("entity_type", "infrastructure"),
+                entity_name=entity_name,
+                claims=ver_data.get("claims_analyzed") or claims[:2],
+                verdict=Verdict.__members__.get(ver_data.get("verdict", "UNCERTAIN"), Verdict.UNCERTAIN),
+                severity=(ver_data.get("contradictions") or [{}])[0].get("severity", "high"),
+                temporal_analysis=ver_data.get("temporal_analysis"),
+                recommended_action=ActionType.__members__.get(
+                    ver_data.get("recommended_action", "FLAG_FOR_HUMAN"),
+                    ActionType.FLAG_FOR_HUMAN
+                ),
+                recommended_action_details=ver_data.get("recommended_action_details", ""),
+                urgency=_parse_urgency(ver_data.get("urgency", "high")),
+                created_at=datetime.utcnow()
+            )
 
-                try:
-                    verification_output = await self.verification_agent.process(verification_input)
-                    ver_data = verification_output.data
-
-                    if ver_data.get("verdict") in ["CONTRADICTION", "TEMPORAL_GAP"]:
-                        alert_id = f"alert_{str(uuid.uuid4())[:8]}"
-
-                        verdict_map = {
-                            "CONTRADICTION": Verdict.CONTRADICTION,
-                            "TEMPORAL_GAP": Verdict.TEMPORAL_GAP,
-                            "CONSISTENT": Verdict.CONSISTENT,
-                            "UNCERTAIN": Verdict.UNCERTAIN
-                        }
-                        action_map = {
-                            "REQUEST_VERIFICATION": ActionType.REQUEST_VERIFICATION,
-                            "FLAG_FOR_HUMAN": ActionType.FLAG_FOR_HUMAN,
-                            "ACCEPT": ActionType.ACCEPT,
-                            "WAIT": ActionType.WAIT
-                        }
-
-                        alert = ContradictionAlert(
-                            id=alert_id,
-                            entity_id=entity_name.lower().replace(" ", "_"),
-                            entity_type=ver_data.get("entity_type", "infrastructure"),
-                            entity_name=entity_name,
-                            claims=ver_data.get("claims_analyzed") or claims[:2],
-                            verdict=verdict_map.get(ver_data.get("verdict", "UNCERTAIN"), Verdict.UNCERTAIN),
-                            severity=(ver_data.get("contradictions") or [{}])[0].get("severity", "high"),
-                            temporal_analysis=ver_data.get("temporal_analysis"),
-                            recommended_action=action_map.get(
-                                ver_data.get("recommended_action", "FLAG_FOR_HUMAN"),
-                                ActionType.FLAG_FOR_HUMAN
-                            ),
-                            recommended_action_details=ver_data.get("recommended_action_details", ""),
-                            urgency=_parse_urgency(ver_data.get("urgency", "high")),
-                            created_at=datetime.utcnow()
-                        )
-
-                        self.graph_manager.add_contradiction(alert)
-
-                        # Broadcast contradiction alert
-                        print(f"[CONTRADICTION ALERT] Created alert for entity: {entity_name} (verdict: {ver_data.get('verdict')})")
-                        await broadcast("contradiction_alert", alert.model_dump(mode="json"))
-                        self._add_event("contradiction_detected", {
-                            "alert_id": alert_id,
-                            "entity": entity_name,
-                            "verdict": ver_data.get("verdict")
-                        })
+            self.graph_manager.add_contradiction(alert)
 
-                        # Mark entity as handled and clear claims
-                        self.handled_contradictions.add(entity_name)
-                        print(f"[CONTRADICTION HANDLED] Added '{entity_name}' to handled set. Total handled: {len(self.handled_contradictions)}")
-                        if entity_name in self.signal_claims:
-                            del self.signal_claims[entity_name]
-                        break
-
-                except Exception as e:
-                    import traceback
-                    print(f"Error in contradiction check for '{entity_name}': {e}")
-                    traceback.print_exc()
-                    # Clean up claims on error to prevent repeated processing
-                    if entity_name in self.signal_claims:
-                        del self.signal_claims[entity_name]
-
-    async def _maybe_generate_recommendations(self):
-        """Generate action recommendations if needed."""
-        from api.websocket import broadcast
+            # Queue contradiction alert for broadcast
+            logger.info("Contradiction alert entity=%s verdict=%s", entity_name, ver_data.get("verdict"))
+            events.append(("contradiction_alert", dumps_node(alert)))
+            self._add_event("contradiction_detected", {
+                "alert_id": alert_id,
+                "entity": entity_name,
+                "verdict": ver_data.get("verdict")
+            })
+
+            # Mark entity as handled and clear claims
+            self.handled_contradictions.add(entity_name)
+            logger.debug("Contradiction handled entity=%s total=%d", entity_name, len(self.handled_contradictions))
+            self.signal_claims.pop(entity_name, None)
+
+    async def _verify_one(self, entity_name: str, claims: list[dict]) -> Optional[dict]:
+        """Run the verification agent for one entity; returns its data if it flags a contradiction."""
+        verification_input = {
+            "entity": entity_name,
+            "entity_type": "infrastructure",
+            "claims": list(claims)
+        }
+        async with self._verification_sem:
+            verification_output = await self.verification_agent.process(verification_input)
+        ver_data = verification_output.data
+        if ver_data.get("verdict") in ["CONTRADICTION", "TEMPORAL_GAP"]:
+            return ver_data
+        return None
+
+    def _maybe_generate_recommendations(self, *, now: datetime):
+        """Start a planning run in the background if one is warranted."""
+        # Single in-flight planning call; its result is broadcast when it lands
+        if self._planning_inflight is not None and not self._planning_inflight.done():
+            return
 
         # Cooldown: don't hammer the planning agent on every signal
-        now = datetime.utcnow()
         if self._last_planning_call is not None:
             elapsed = (now - self._last_planning_call).total_seconds()
             if elapsed < self._planning_cooldown_seconds:
                 return
 
         # Check for unaddressed critical incidents with available resources
-        critical_incidents = [
-            i for i in self.graph_manager.graph.incidents.values()
-            if i.urgency in [Urgency.CRITICAL, Urgency.HIGH]
-            and i.status == "active"
-            and len(i.assigned_resources) == 0
-        ]
+        critical_incidents = self.graph_manager.get_unaddressed_critical_incidents()
 
         if not critical_incidents:
             return
@@ -387,18 +509,8 @@ class Coordinator:
 
         # Build context for planning agent
         all_incidents = [
-            {
-                "id": i.id,
-                "incident_type": i.incident_type,
-                "sector": i.location.sector or "unknown",
-                "urgency": i.urgency.value,
-                "confidence": i.confidence,
-                "trapped_min": i.trapped_min,
-                "trapped_max": i.trapped_max,
-                "status": i.status
-            }
-            for i in self.graph_manager.graph.incidents.values()
-            if i.status == "active"
+            self.graph_manager.incident_context(i)
+            for i in self.graph_manager.get_active_incidents()
         ]
 
         all_resources = [
@@ -412,15 +524,11 @@ class Coordinator:
             for r in available_resources[:6]  # Limit for context
         ]
 
-        hospital_capacity = {}
-        for loc in self.graph_manager.graph.locations.values():
-            if loc.location_type == "hospital" and loc.capacity_total:
-                capacity_used = loc.capacity_used or 0
-                hospital_capacity[loc.id] = f"{capacity_used}/{loc.capacity_total}"
+        hospital_capacity = self.graph_manager.get_hospital_capacity()
 
-        try:
-            self._last_planning_call = datetime.utcnow()
-            planning_output = await self.planning_agent.process({
+        self._last_planning_call = now
+        self._planning_inflight = self._spawn(self._run_planning(
+            {
                 "incidents": all_incidents,
                 "resources": all_resources,
                 "constraints": {
@@ -428,7 +536,20 @@ class Coordinator:
                     "road_blockages": "Route 12 partially blocked",
                     "weather": "Clear, wind 10km/h NE"
                 }
-            })
+            },
+            fallback_target_id=critical_incidents[0].id,
+            fallback_resources=[r.unit_id for r in available_resources[:3]]
+        ))
+
+    async def _run_planning(self, planning_input: dict, *, fallback_target_id: str,
+                            fallback_resources: list[str]):
+        """Call the planning agent and broadcast the resulting recommendation."""
+        from api.websocket import broadcast_many
+
+        try:
+            planning_output = await self.planning_agent.process(planning_input)
+            # Stamp the recommendation when it exists, so its approval window isn't eaten by the planner call
+            now = datetime.utcnow()
 
             plan_data = planning_output.data
             recommendation = plan_data.get("recommendation", {})
@@ -436,34 +557,37 @@ class Coordinator:
 
             # Find target incident
             target_incident_id = recommendation.get("target", {}).get("incident_id")
-            if not target_incident_id and critical_incidents:
-                target_incident_id = critical_incidents[0].id
+            if not target_incident_id:
+                target_incident_id = fallback_target_id
 
             target_location = None
             if target_incident_id and target_incident_id in self.graph_manager.graph.incidents:
                 target_location = self.graph_manager.graph.incidents[target_incident_id].location
 
-            action_id = f"action_{str(uuid.uuid4())[:8]}"
-            action = ActionRecommendation(
+            action_id = f"action_{_short_id()}"
+            time_sensitivity = _parse_urgency(plan_data.get("time_sensitivity", "critical"))
+            target_sector = recommendation.get("target", {}).get("sector")
+            # Planner output is coerced field by field, so skip re-validation
+            action = ActionRecommendation.model_construct(
                 id=action_id,
-                action_type=recommendation.get("action", "dispatch_resources"),
+                action_type=str(recommendation.get("action") or "dispatch_resources"),
                 target_incident_id=target_incident_id,
                 target_location=target_location,
-                target_sector=recommendation.get("target", {}).get("sector"),
-                resources_to_allocate=recommendation.get("resources") or [r.unit_id for r in available_resources[:3]],
-                rationale=rationale.get("primary_reason", planning_output.reasoning),
-                supporting_factors=rationale.get("supporting_factors") or [],
-                confidence=rationale.get("confidence", planning_output.confidence),
-                tradeoffs=plan_data.get("tradeoffs") or [],
-                uncertainty_factors=plan_data.get("uncertainty_factors") or [],
-                requires_human_approval=plan_data.get("human_approval_required", True),
-                decision_deadline=datetime.utcnow() + timedelta(minutes=5),
-                time_sensitivity=_parse_urgency(plan_data.get("time_sensitivity", "critical")),
-                created_at=datetime.utcnow()
+                target_sector=str(target_sector) if target_sector is not None else None,
+                resources_to_allocate=[str(r) for r in recommendation.get("resources") or fallback_resources],
+                rationale=str(rationale.get("primary_reason") or planning_output.reasoning),
+                supporting_factors=[str(f) for f in rationale.get("supporting_factors") or []],
+                confidence=_unit_score(rationale.get("confidence", planning_output.confidence), 0.5),
+                tradeoffs=[t for t in plan_data.get("tradeoffs") or [] if isinstance(t, dict)],
+                uncertainty_factors=[str(f) for f in plan_data.get("uncertainty_factors") or []],
+                requires_human_approval=bool(plan_data.get("human_approval_required", True)),
+                decision_deadline=now + timedelta(minutes=5),
+                time_sensitivity=time_sensitivity,
+                time_sensitivity_rank=URGENCY_RANK.get(time_sensitivity, 4),
+                created_at=now
             )
 
             self.graph_manager.add_action(action)
-            await broadcast("action_recommendation", action.model_dump(mode="json"))
             self._add_event("action_recommended", {
                 "action_id": action_id,
                 "action_type": action.action_type,
@@ -471,12 +595,24 @@ class Coordinator:
             })
 
         except Exception as e:
-            print(f"Error generating recommendation: {e}")
+            logger.error("Error generating recommendation: %s", e)
+            return
 
-    async def _broadcast_incident(self, incident: IncidentNode):
-        """Broadcast new incident to clients."""
-        from api.websocket import broadcast
-        await broadcast("new_incident", incident.model_dump(mode="json"))
+        events = [("action_recommendation", dumps_node(action))]
+        patch = self.graph_manager.take_patch()
+        if patch:
+            events.append(("graph_patch", patch))
+        events.append(("timeline_event", {
+            "events": self.recent_events_tail(10)
+        }))
+        await broadcast_many(events)
+
+    async def _broadcast_graph_patch(self):
+        """Send clients only the graph nodes changed since the last patch."""
+        from api.websocket import broadcast_raw
+        patch = self.graph_manager.take_patch()
+        if patch:
+            await broadcast_raw("graph_patch", dumps(patch))
 
     async def resolve_contradiction(self, alert_id: str, decision: HumanDecision):
         """Handle human resolution of contradiction."""
@@ -493,7 +629,7 @@ class Coordinator:
             "id": alert_id,
             "decision": decision.decision
         })
-        await broadcast("graph_update", self.graph_manager.graph.model_dump(mode="json"))
+        await self._broadcast_graph_patch()
 
         self._add_event("contradiction_resolved", {
             "alert_id": alert_id,
@@ -516,7 +652,7 @@ class Coordinator:
             "decision": "approved",
             "resources": action.resources_to_allocate
         })
-        await broadcast("graph_update", self.graph_manager.graph.model_dump(mode="json"))
+        await self._broadcast_graph_patch()
 
         self._add_event("action_approved", {
             "action_id": action_id,
@@ -539,7 +675,7 @@ class Coordinator:
             "decision": "rejected",
             "reason": reason
         })
-        await broadcast("graph_update", self.graph_manager.graph.model_dump(mode="json"))
+        await self._broadcast_graph_patch()
 
         return action
 
@@ -575,11 +711,12 @@ class Coordinator:
 
         self.signal_claims.clear()
         self.handled_contradictions.clear()
+        self._pending_verification.clear()
         self.recent_events.clear()
         self.graph_manager.reset()
 
-        from api.websocket import broadcast
-        await broadcast("graph_update", self.graph_manager.graph.model_dump(mode="json"))
+        from api.websocket import broadcast_graph_update
+        await broadcast_graph_update(self.graph_manager)
 
     def get_simulation_status(self) -> dict:
         return {
@@ -603,18 +740,17 @@ class Coordinator:
         if not alert:
             return []
 
-        debate_agent = DebateAgent()
         self._add_event("debate_started", {"alert_id": alert_id, "entity": alert.entity_name})
 
-        turns = await debate_agent.run_debate(alert, broadcast)
+        turns = await self.debate_agent.run_debate(alert, broadcast)
         self._add_event("debate_completed", {"alert_id": alert_id, "turns": len(turns)})
         return [t.model_dump(mode="json") for t in turns]
 
     async def get_decision_audit(self, decision_id: str) -> dict:
-        return self.graph_manager.get_decision_audit(decision_id)
+        return await self.graph_manager.get_decision_audit(decision_id)
 
     async def get_incident_audit(self, incident_id: str) -> dict:
-        return self.graph_manager.get_incident_audit(incident_id)
+        return await self.graph_manager.get_incident_audit(incident_id)
 
     # ============== RESOURCE ALLOCATION ==============
 
@@ -624,16 +760,8 @@ class Coordinator:
 
         # Build context from current graph
         all_incidents = [
-            {
-                "id": i.id, "incident_type": i.incident_type,
-                "sector": i.location.sector or "unknown",
-                "urgency": i.urgency.value, "confidence": i.confidence,
-                "trapped_min": i.trapped_min, "trapped_max": i.trapped_max,
-                "status": i.status,
-                "lat": i.location.lat, "lng": i.location.lng
-            }
-            for i in self.graph_manager.graph.incidents.values()
-            if i.status == "active"
+            self.graph_manager.incident_context(i)
+            for i in self.graph_manager.get_active_incidents()
         ]
 
         all_resources = [
@@ -661,21 +789,21 @@ class Coordinator:
             "resources": all_resources,
             "locations": all_locations,
             "constraints": {
-                "hospital_capacity": {l["name"]: f"{l['capacity_used']}/{l['capacity_total']}" for l in all_locations if l["location_type"] == "hospital" and l["capacity_total"]},
+                "hospital_capacity": self.graph_manager.get_hospital_capacity(by_name=True),
                 "road_blockages": "Route 12 partially blocked",
                 "weather": "Clear"
             }
         })
 
         plan_data = output.data
-        plan_id = f"plan_{str(uuid.uuid4())[:8]}"
+        plan_id = f"plan_{_short_id()}"
         now = datetime.utcnow()
 
         # Build assignments
         assignments = []
         for a in plan_data.get("resource_assignments", []):
             assignments.append(ResourceAssignment(
-                id=f"assign_{str(uuid.uuid4())[:6]}",
+                id=f"assign_{_short_id(3)}",
                 resource_id=a.get("resource_id", ""),
                 target_incident_id=a.get("target_incident_id", ""),
                 rationale=a.get("rationale", ""),
@@ -689,7 +817,7 @@ class Coordinator:
         for c in plan_data.get("camp_recommendations", []):
             loc = c.get("location", {})
             camps.append(CampRecommendation(
-                id=f"camp_{str(uuid.uuid4())[:6]}",
+                id=f"camp_{_short_id(3)}",
                 name=c.get("name", "Camp"),
                 location=Location(lat=loc.get("lat", 37.78), lng=loc.get("lng", -122.41)),
                 camp_type=c.get("camp_type", "relief_camp"),
@@ -721,14 +849,16 @@ class Coordinator:
             self.graph_manager.add_camp(camp)
         return plan.camp_recommendations
 
-    def _add_event(self, event_type: str, data: dict):
+    def _add_event(self, event_type: str, data: dict, timestamp: Optional[str] = None):
         event = {
-            "id": str(uuid.uuid4())[:8],
+            "id": f"{next(_event_ids):08x}",
             "type": event_type,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": timestamp or _utc_iso_second(time.time_ns() // 1_000_000_000),
             "data": data
         }
         self.recent_events.append(event)
-        # Keep last 50 events
-        if len(self.recent_events) > 50:
-            self.recent_events = self.recent_events[-50:]
+
+    def recent_events_tail(self, n: int) -> list[dict]:
+        """Return the newest n events, oldest first."""
+        events = self.recent_events
+        return list(islice(events, max(0, len(events) - n), None))
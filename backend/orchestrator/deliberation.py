@@ -3,6 +3,9 @@ Deliberation module - handles agent disagreement and consensus building.
 """
 from datetime import datetime
 from typing import Optional
+
+import orjson
+
 from agents.base_agent import AgentOutput
 
 
@@ -29,29 +32,57 @@ def deliberate(outputs: list[AgentOutput]) -> DeliberationResult:
             outputs[0].confidence
         )
 
-    # Find fields that all agents agree on vs disagree on
-    all_keys = set()
+    # Fast path: every agent returned the same data, so every field is consensus
+    if _all_same_data(outputs):
+        return DeliberationResult(
+            dict(outputs[0].data),
+            [],
+            sum(o.confidence for o in outputs) / len(outputs)
+        )
+
+    # Single pass: per field, the first value (and its str form), whether every
+    # later value matched it, and each contributing agent's value
+    fields: dict[str, list] = {}
+    total_weight = 0.0
     for output in outputs:
-        all_keys.update(output.data.keys())
+        total_weight += output.confidence
+        for key, value in output.data.items():
+            entry = fields.get(key)
+            if entry is None:
+                fields[key] = [value, str(value), True, [(output, value)]]
+                continue
+            if entry[2] and str(value) != entry[1]:
+                entry[2] = False
+            entry[3].append((output, value))
 
     consensus = {}
     disagreements = []
-
-    for key in all_keys:
-        values = [o.data.get(key) for o in outputs if key in o.data]
-        if len(set(str(v) for v in values)) == 1:
-            consensus[key] = values[0]
+    for key, (first, _, agreed, contributions) in fields.items():
+        if agreed:
+            consensus[key] = first
         else:
             disagreements.append({
                 "field": key,
                 "values": [
-                    {"agent": o.agent_name, "value": o.data.get(key), "confidence": o.confidence}
-                    for o in outputs if key in o.data
+                    {"agent": o.agent_name, "value": value, "confidence": o.confidence}
+                    for o, value in contributions
                 ]
             })
 
     # Weighted average confidence
-    total_weight = sum(o.confidence for o in outputs)
-    final_confidence = total_weight / len(outputs) if outputs else 0.0
+    final_confidence = total_weight / len(outputs)
 
     return DeliberationResult(consensus, disagreements, final_confidence)
+
+
+def _all_same_data(outputs: list[AgentOutput]) -> bool:
+    """True if every output's data serializes identically (conservative: False when unsure)."""
+    first = outputs[0].data
+    try:
+        fingerprint = orjson.dumps(first, option=orjson.OPT_SORT_KEYS)
+        return all(
+            o.data is first or orjson.dumps(o.data, option=orjson.OPT_SORT_KEYS) == fingerprint
+            for o in outputs[1:]
+        )
+    except TypeError:
+        return False
@@ -2,35 +2,55 @@
 Demo simulation engine - plays back the earthquake scenario timeline.
 """
 import asyncio
-import json
+import logging
 import os
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 import uuid
 
+import orjson
+
+from api.websocket import broadcast, broadcast_raw, schedule_graph_update
+from graph.encoding import dumps_node
 from graph.schemas import (
     IncidentNode, ResourceNode, LocationNode, SourceReference,
     DamageLevel, Urgency, SourceType, Location, ContradictionAlert,
-    ActionRecommendation, Verdict, ActionType
+    ActionRecommendation, Verdict, ActionType, entity_id_for
 )
 
+logger = logging.getLogger(__name__)
+
+# Seconds between full graph_update broadcasts during a simulation
+FULL_SYNC_INTERVAL = 5.0
+
+# Batch signals processed at once within a signal_batch event
+SIGNAL_BATCH_CONCURRENCY = 4
+
+# Sector -> (lat, lng) base position for scenario resources
+_RESOURCE_LOCATIONS = {
+    "1": (37.790, -122.402),
+    "2": (37.780, -122.410),
+    "3": (37.772, -122.418),
+    "4": (37.760, -122.405),
+    "5": (37.755, -122.415),
+}
+_DEFAULT_RESOURCE_LOCATION = (37.78, -122.41)
+
 
 async def run_simulation(coordinator, scenario_id: str, speed: float = 1.0):
     """Run the demo simulation."""
-    from api.websocket import broadcast
-
     # Load scenario
     scenario = _load_scenario(scenario_id)
     if not scenario:
-        print(f"Scenario {scenario_id} not found, using default")
+        logger.warning("Scenario %s not found, using default", scenario_id)
         scenario = _get_default_scenario()
 
     # Initialize graph metadata
     now = datetime.utcnow()
-    coordinator.graph_manager.graph.scenario_id = scenario_id
-    coordinator.graph_manager.graph.scenario_name = scenario.get("scenario_name", "Metro City Earthquake")
-    coordinator.graph_manager.graph.scenario_start_time = now
-    coordinator.graph_manager.graph.current_sim_time = now
+    coordinator.graph_manager.set_scenario(
+        scenario_id, scenario.get("scenario_name", "Metro City Earthquake"), now
+    )
 
     # Load initial resources
     await _load_initial_resources(coordinator, scenario.get("initial_resources", {}), now)
@@ -38,33 +58,29 @@ async def run_simulation(coordinator, scenario_id: str, speed: float = 1.0):
     # Load initial locations
     await _load_initial_locations(coordinator, scenario.get("initial_locations", []), now)
 
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+    await coordinator._broadcast_graph_patch()
     await broadcast("sim_status", coordinator.get_simulation_status())
 
-    print(f"Starting simulation: {scenario.get('scenario_name')}")
+    logger.info("Starting simulation: %s", scenario.get("scenario_name"))
 
     # Process events in order
     events = scenario.get("events", [])
 
-    try:
-        for event in events:
-            if not coordinator.simulation_running:
-                # Wait if paused
-                while coordinator.simulation_paused:
-                    await asyncio.sleep(0.2)
-                if not coordinator.simulation_running and not coordinator.simulation_paused:
-                    break
+    # Events send graph_patch deltas; a periodic full graph_update keeps clients honest
+    sync_task = asyncio.create_task(_full_sync_loop(coordinator))
 
-            offset = event.get("time_offset_seconds", 0)
+    # A pacing task releases events at absolute deadlines; this loop consumes them,
+    # so slow processing doesn't push back the schedule of later events
+    queue: asyncio.Queue = asyncio.Queue()
+    pacer = asyncio.create_task(_pace_events(coordinator, events, speed, queue))
 
-            # Wait per-event delay (human-observable pacing)
-            demo_delay = event.get("demo_delay_seconds", 3.0)
-            actual_wait = max(0.3, demo_delay / speed)
-            await asyncio.sleep(actual_wait)
+    try:
+        while (event := await queue.get()) is not None:
+            offset = event.get("time_offset_seconds", 0)
 
             # Update simulation time
             sim_time_offset = timedelta(seconds=offset)
-            coordinator.graph_manager.graph.current_sim_time = now + sim_time_offset
+            coordinator.graph_manager.set_sim_time(now + sim_time_offset)
 
             event_type = event.get("event_type")
 
@@ -75,15 +91,50 @@ async def run_simulation(coordinator, scenario_id: str, speed: float = 1.0):
                 # Non-signal events (contradiction_inject, aftershock, etc.) are lightweight — await them
                 await _process_sim_event(coordinator, event, now + sim_time_offset)
 
+            # One last_updated stamp per tick for everything mutated above
+            coordinator.graph_manager.commit()
             await broadcast("sim_status", coordinator.get_simulation_status())
 
     except Exception as e:
-        import traceback
-        print(f"Simulation error: {e}")
-        traceback.print_exc()
+        logger.exception("Simulation error: %s", e)
+    finally:
+        pacer.cancel()
+        sync_task.cancel()
 
     coordinator.simulation_running = False
-    print("Simulation complete")
+    schedule_graph_update(coordinator.graph_manager)
+    logger.info("Simulation complete")
+
+
+async def _pace_events(coordinator, events: list[dict], speed: float, queue: asyncio.Queue):
+    """Put each event on `queue` at its deadline, then None once the scenario is done or stopped."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time()
+    try:
+        for event in events:
+            if not coordinator.simulation_running:
+                # Wait if paused; time spent paused doesn't count against the schedule
+                paused_at = loop.time()
+                while coordinator.simulation_paused:
+                    await asyncio.sleep(0.2)
+                if not coordinator.simulation_running:
+                    break
+                deadline += loop.time() - paused_at
+
+            # Per-event delay (human-observable pacing), measured from the previous deadline
+            demo_delay = event.get("demo_delay_seconds", 3.0)
+            deadline += max(0.3, demo_delay / speed)
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+            queue.put_nowait(event)
+    finally:
+        queue.put_nowait(None)
+
+
+async def _full_sync_loop(coordinator):
+    """Broadcast the full graph every FULL_SYNC_INTERVAL seconds while the simulation runs."""
+    while True:
+        await asyncio.sleep(FULL_SYNC_INTERVAL)
+        schedule_graph_update(coordinator.graph_manager)
 
 
 async def _process_sim_event(coordinator, event: dict, sim_time: datetime):
@@ -96,9 +147,14 @@ async def _process_sim_event(coordinator, event: dict, sim_time: datetime):
 
     elif event_type == "signal_batch":
         signals = data.get("signals", [])
-        for signal in signals:
-            await _process_signal_event(coordinator, signal, sim_time)
-            await asyncio.sleep(0.3)  # Small delay between batch signals
+        # Signals in a batch go through the agents concurrently, a few at a time
+        sem = asyncio.Semaphore(SIGNAL_BATCH_CONCURRENCY)
+
+        async def process_one(signal: dict):
+            async with sem:
+                await _process_signal_event(coordinator, signal, sim_time)
+
+        await asyncio.gather(*(process_one(signal) for signal in signals))
 
     elif event_type == "aftershock":
         await _process_aftershock(coordinator, data, sim_time)
@@ -110,9 +166,8 @@ async def _process_sim_event(coordinator, event: dict, sim_time: datetime):
         await _inject_contradiction(coordinator, data, sim_time)
 
     elif event_type == "time_marker":
-        from api.websocket import broadcast
         coordinator._add_event("time_marker", {"label": data.get("label", "")})
-        await broadcast("timeline_event", {"events": coordinator.recent_events[-10:]})
+        await broadcast("timeline_event", {"events": coordinator.recent_events_tail(10)})
 
 
 async def _process_signal_event(coordinator, data: dict, sim_time: datetime):
@@ -135,8 +190,7 @@ async def _process_signal_event(coordinator, data: dict, sim_time: datetime):
     if not content:
         content = data.get("description", "Simulated emergency signal")
 
-    from api.websocket import broadcast
-
+    # process_signal broadcasts the resulting graph_patch itself
     # For text signals, use the content directly
     if signal_type == "text":
         metadata["source_type"] = data.get("source_type", "unverified")
@@ -152,26 +206,20 @@ async def _process_signal_event(coordinator, data: dict, sim_time: datetime):
         metadata["description"] = content
         await coordinator.process_signal("image", "", metadata)
 
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
-
 
 async def _process_aftershock(coordinator, data: dict, sim_time: datetime):
     """Handle aftershock event."""
-    from api.websocket import broadcast
-
     magnitude = data.get("magnitude", 4.2)
     coordinator._add_event("aftershock", {
         "magnitude": magnitude,
         "sim_time": sim_time.isoformat()
     })
 
-    # Decay confidences
-    coordinator.graph_manager.decay_confidences(5.0)
-
-    # Broadcast update
-    await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+    # Decay confidences, broadcasting the incidents that changed
+    if coordinator.graph_manager.decay_confidences(5.0):
+        await coordinator._broadcast_graph_patch()
     await broadcast("timeline_event", {
-        "events": coordinator.recent_events[-10:],
+        "events": coordinator.recent_events_tail(10),
         "alert": {
             "type": "aftershock",
             "message": f"⚡ AFTERSHOCK {magnitude}M - Updating confidence levels",
@@ -182,8 +230,6 @@ async def _process_aftershock(coordinator, data: dict, sim_time: datetime):
 
 async def _process_resource_change(coordinator, data: dict):
     """Handle resource status change."""
-    from api.websocket import broadcast
-
     resource_id = data.get("resource_id")
     updates = data.get("updates", {})
 
@@ -193,15 +239,14 @@ async def _process_resource_change(coordinator, data: dict):
             "resource_id": resource_id,
             "updates": updates
         })
+        await coordinator._broadcast_graph_patch()
 
 
 async def _inject_contradiction(coordinator, data: dict, sim_time: datetime):
     """Inject a pre-scripted contradiction into the system."""
-    from api.websocket import broadcast
-
     entity_name = data.get("entity", "Unknown")
     claims = data.get("claims", [])
-    print(f"[CONTRADICTION INJECT] Starting injection for entity: {entity_name}")
+    logger.debug("Injecting contradiction for entity=%s", entity_name)
 
     # Add claims to the signal_claims tracker
     if entity_name not in coordinator.signal_claims:
@@ -227,32 +272,19 @@ async def _inject_contradiction(coordinator, data: dict, sim_time: datetime):
 
             # Build contradiction alert
             alert_id = f"alert_{str(uuid.uuid4())[:8]}"
-            verdict_map = {
-                "CONTRADICTION": Verdict.CONTRADICTION,
-                "TEMPORAL_GAP": Verdict.TEMPORAL_GAP,
-                "CONSISTENT": Verdict.CONSISTENT,
-                "UNCERTAIN": Verdict.UNCERTAIN
-            }
-            action_map = {
-                "REQUEST_VERIFICATION": ActionType.REQUEST_VERIFICATION,
-                "FLAG_FOR_HUMAN": ActionType.FLAG_FOR_HUMAN,
-                "ACCEPT": ActionType.ACCEPT,
-                "WAIT": ActionType.WAIT
-            }
-
             # Force verdict for bridge demo
             verdict_str = ver_data.get("verdict", data.get("force_verdict", "CONTRADICTION"))
 
             alert = ContradictionAlert(
                 id=alert_id,
-                entity_id=entity_name.lower().replace(" ", "_"),
+                entity_id=entity_id_for(entity_name),
                 entity_type=data.get("entity_type", "infrastructure"),
                 entity_name=entity_name,
                 claims=coordinator.signal_claims[entity_name],
-                verdict=verdict_map.get(verdict_str, Verdict.CONTRADICTION),
+                verdict=Verdict.__members__.get(verdict_str, Verdict.CONTRADICTION),
                 severity="high",
                 temporal_analysis=ver_data.get("temporal_analysis") or data.get("temporal_analysis", ""),
-                recommended_action=action_map.get(
+                recommended_action=ActionType.__members__.get(
                     ver_data.get("recommended_action", "REQUEST_VERIFICATION"),
                     ActionType.REQUEST_VERIFICATION
                 ),
@@ -264,19 +296,17 @@ async def _inject_contradiction(coordinator, data: dict, sim_time: datetime):
             coordinator.graph_manager.add_contradiction(alert)
             coordinator.handled_contradictions.add(entity_name)
             del coordinator.signal_claims[entity_name]
-            print(f"[CONTRADICTION INJECT] Successfully injected and handled: {entity_name}")
+            logger.info("Injected contradiction entity=%s", entity_name)
 
-            await broadcast("contradiction_alert", alert.model_dump(mode="json"))
+            await broadcast_raw("contradiction_alert", dumps_node(alert))
             coordinator._add_event("contradiction_detected", {
                 "alert_id": alert_id,
                 "entity": entity_name
             })
-            await broadcast("graph_update", coordinator.graph_manager.graph.model_dump(mode="json"))
+            await coordinator._broadcast_graph_patch()
 
         except Exception as e:
-            import traceback
-            print(f"Error in contradiction injection for '{entity_name}': {e}")
-            traceback.print_exc()
+            logger.exception("Error in contradiction injection for '%s': %s", entity_name, e)
             # Clean up claims on error to prevent repeated processing
             if entity_name in coordinator.signal_claims:
                 del coordinator.signal_claims[entity_name]
@@ -284,36 +314,33 @@ async def _inject_contradiction(coordinator, data: dict, sim_time: datetime):
 
 async def _load_initial_resources(coordinator, resources_data: dict, now: datetime):
     """Load initial resources from scenario."""
-    resource_locations = {
-        "1": {"lat": 37.790, "lng": -122.402},
-        "2": {"lat": 37.780, "lng": -122.410},
-        "3": {"lat": 37.772, "lng": -122.418},
-        "4": {"lat": 37.760, "lng": -122.405},
-        "5": {"lat": 37.755, "lng": -122.415},
-    }
-
+    resources = []
     for resource_type, items in resources_data.items():
         if not isinstance(items, list):
             continue
         for item in items:
             sector = item.get("sector", "1")
-            loc = resource_locations.get(str(sector), {"lat": 37.78, "lng": -122.41})
+            lat, lng = _RESOURCE_LOCATIONS.get(str(sector), _DEFAULT_RESOURCE_LOCATION)
+            # Spread units around their sector base; lat/lng offsets come from separate 16-bit lanes of one hash
+            h = hash(item.get("id", ""))
 
-            resource = ResourceNode(
-                id=item.get("id", str(uuid.uuid4())[:8]),
+            # Scenario files ship with the repo; coerce the numbers and skip re-validation
+            resource = ResourceNode.model_construct(
+                id=str(item.get("id", str(uuid.uuid4())[:8])),
                 resource_type=resource_type.rstrip("s"),  # ambulances -> ambulance
-                unit_id=item.get("id", "UNIT-?"),
-                current_location=Location(
-                    lat=loc["lat"] + (hash(item.get("id", "")) % 50 - 25) * 0.0005,
-                    lng=loc["lng"] + (hash(item.get("id", "")[::-1]) % 50 - 25) * 0.0005,
+                unit_id=str(item.get("id", "UNIT-?")),
+                current_location=Location.model_construct(
+                    lat=lat + ((h & 0xFFFF) % 50 - 25) * 0.0005,
+                    lng=lng + (((h >> 16) & 0xFFFF) % 50 - 25) * 0.0005,
                     sector=str(sector)
                 ),
                 status=item.get("status", "available"),
-                personnel=item.get("personnel", 2),
+                personnel=int(item.get("personnel", 2)),
                 capacity_remaining=2,
                 updated_at=now
             )
-            coordinator.graph_manager.add_resource(resource)
+            resources.append(resource)
+    coordinator.graph_manager.add_resources(resources)
 
 
 async def _load_initial_locations(coordinator, locations_data: list, now: datetime):
@@ -348,23 +375,29 @@ async def _load_initial_locations(coordinator, locations_data: list, now: dateti
 
     locs_to_load = locations_data if locations_data else default_locations
 
-    for loc_data in locs_to_load:
-        location = LocationNode(
-            id=loc_data.get("id", str(uuid.uuid4())[:8]),
-            location=Location(
-                lat=loc_data.get("lat", 37.78),
-                lng=loc_data.get("lng", -122.41),
+    coordinator.graph_manager.add_locations([
+        LocationNode.model_construct(
+            id=str(loc_data.get("id", str(uuid.uuid4())[:8])),
+            location=Location.model_construct(
+                lat=float(loc_data.get("lat", 37.78)),
+                lng=float(loc_data.get("lng", -122.41)),
                 name=loc_data.get("name")
             ),
             location_type=loc_data.get("location_type", "infrastructure"),
-            capacity_total=loc_data.get("capacity_total"),
-            capacity_used=loc_data.get("capacity_used"),
+            capacity_total=_int_or_none_strict(loc_data.get("capacity_total")),
+            capacity_used=_int_or_none_strict(loc_data.get("capacity_used")),
             status=loc_data.get("status", "operational"),
             accessibility=loc_data.get("accessibility", "accessible"),
             confidence=0.9,
             updated_at=now
         )
-        coordinator.graph_manager.add_location(location)
+        for loc_data in locs_to_load
+    ])
+
+
+def _int_or_none_strict(raw) -> Optional[int]:
+    """int(raw), keeping None; raises on a non-numeric value, as model validation did."""
+    return None if raw is None else int(raw)
 
 
 def _load_scenario(scenario_id: str) -> Optional[dict]:
@@ -377,13 +410,23 @@ def _load_scenario(scenario_id: str) -> Optional[dict]:
 
     for path in paths:
         abs_path = os.path.abspath(path)
-        if os.path.exists(abs_path):
-            with open(abs_path) as f:
-                return json.load(f)
+        try:
+            mtime = os.stat(abs_path).st_mtime_ns
+        except OSError:
+            continue
+        # Parse per call: the simulation hands parts of the scenario to graph nodes
+        return orjson.loads(_read_scenario(abs_path, mtime))
 
     return None
 
 
+@lru_cache(maxsize=16)
+def _read_scenario(abs_path: str, mtime: int) -> bytes:
+    """Scenario file contents, cached until the file's mtime changes."""
+    with open(abs_path, "rb") as f:
+        return f.read()
+
+
 def _get_default_scenario() -> dict:
     """Return hardcoded default scenario."""
     return {
@@ -8,7 +8,7 @@ import { ResourcesPage } from './pages/ResourcesPage';
 import { VoicePage } from './pages/VoicePage';
 import { useWebSocket } from './hooks/useWebSocket';
 import { useSituationGraph } from './hooks/useSituationGraph';
-import { SituationGraph, TimelineEvent, VoiceReport } from './types';
+import { SituationGraph, GraphPatch, TimelineEvent, VoiceReport } from './types';
 import { ProcessedSignal } from './components/signals/SignalIntelligence';
 import { DebateTurn } from './types/debate';
 
@@ -18,6 +18,7 @@ function AppContent() {
   const {
     setGraph,
     updateGraph,
+    applyGraphPatch,
     setConnected,
     setSimStatus,
     setWsRef,
@@ -29,12 +30,20 @@ function AppContent() {
   } = useSituationGraph();
 
   const handleMessage = useCallback((message: unknown) => {
-    const msg = message as { type: string; payload: unknown };
+    const msg = message as { type: string; payload: unknown; version?: number };
 
     switch (msg.type) {
+      case 'batch':
+        (msg.payload as unknown[]).forEach(m => handleMessage(m));
+        break;
+
       case 'initial_state':
       case 'graph_update':
-        setGraph(msg.payload as SituationGraph);
+        setGraph(msg.payload as SituationGraph, msg.version ?? 0);
+        break;
+
+      case 'graph_patch':
+        applyGraphPatch(msg.payload as GraphPatch);
         break;
 
       case 'new_incident':
@@ -108,7 +117,7 @@ function AppContent() {
       case 'decision_made':
         break;
     }
-  }, [setGraph, updateGraph, setConnected, setSimStatus, addTimelineEvent, addProcessedSignal, addDebateTurn, addVoiceReport]);
+  }, [setGraph, updateGraph, applyGraphPatch, setConnected, setSimStatus, addTimelineEvent, addProcessedSignal, addDebateTurn, addVoiceReport]);
 
   const { isConnected, send } = useWebSocket({
     url: WS_URL,
@@ -1,5 +1,5 @@
 import { create } from 'zustand';
-import { SituationGraph, ContradictionAlert, ActionRecommendation, TimelineEvent, VoiceReport } from '../types';
+import { SituationGraph, GraphPatch, ContradictionAlert, ActionRecommendation, TimelineEvent, VoiceReport } from '../types';
 import { ProcessedSignal } from '../components/signals/SignalIntelligence';
 import { DebateTurn } from '../types/debate';
 
@@ -14,6 +14,9 @@ interface SimStatus {
 
 interface SituationGraphState {
   graph: SituationGraph | null;
+  // Last graph_patch version applied to `graph`; patches must continue from it
+  graphVersion: number;
+  syncRequested: boolean;
   isConnected: boolean;
   simStatus: SimStatus | null;
   timelineEvents: TimelineEvent[];
@@ -28,8 +31,9 @@ interface SituationGraphState {
   clearDebate: (alertId: string) => void;
 
   // Setters
-  setGraph: (graph: SituationGraph) => void;
+  setGraph: (graph: SituationGraph, version?: number) => void;
   updateGraph: (partial: Partial<SituationGraph>) => void;
+  applyGraphPatch: (patch: GraphPatch) => void;
   setConnected: (connected: boolean) => void;
   setSimStatus: (status: SimStatus) => void;
   setWsRef: (ref: { send: (msg: unknown) => void }) => void;
@@ -53,6 +57,8 @@ interface SituationGraphState {
 
 export const useSituationGraph = create<SituationGraphState>((set, get) => ({
   graph: null,
+  graphVersion: 0,
+  syncRequested: false,
   isConnected: false,
   simStatus: null,
   timelineEvents: [],
@@ -82,12 +88,51 @@ export const useSituationGraph = create<SituationGraphState>((set, get) => ({
     debateTurns: { ...state.debateTurns, [alertId]: [] }
   })),
 
-  setGraph: (graph) => set({ graph }),
+  setGraph: (graph, version) => set(
+    version === undefined ? { graph } : { graph, graphVersion: version, syncRequested: false }
+  ),
 
   updateGraph: (partial) => set((state) => ({
     graph: state.graph ? { ...state.graph, ...partial } : null
   })),
 
+  applyGraphPatch: (patch) => {
+    const { graph: current, graphVersion, syncRequested, wsRef } = get();
+    if (!current) return;
+    // Already covered by the snapshot we hold
+    if (patch.version <= graphVersion) return;
+    if (patch.from !== graphVersion) {
+      // Missed a patch: ask the server once to replay from our version (or resend the graph)
+      if (!syncRequested) {
+        set({ syncRequested: true });
+        wsRef?.send({ type: 'request_sync', payload: { since: graphVersion } });
+      }
+      return;
+    }
+    const graph = { ...current } as unknown as Record<string, unknown>;
+    const copied = new Set<string>();
+    for (const op of patch.ops) {
+      // Paths are "/<field>" or "/<collection>/<node id>"
+      const [key, ...rest] = op.path.slice(1).split('/');
+      if (rest.length === 0) {
+        graph[key] = op.value;
+        continue;
+      }
+      if (!copied.has(key)) {
+        graph[key] = { ...(graph[key] as Record<string, unknown>) };
+        copied.add(key);
+      }
+      const collection = graph[key] as Record<string, unknown>;
+      const id = rest.join('/');
+      if (op.op === 'remove') {
+        delete collection[id];
+      } else {
+        collection[id] = op.value;
+      }
+    }
+    set({ graph: graph as unknown as SituationGraph, graphVersion: patch.version, syncRequested: false });
+  },
+
   setConnected: (connected) => set({ isConnected: connected }),
   setSimStatus: (status) => set({ simStatus: status }),
   setWsRef: (ref) => set({ wsRef: ref }),
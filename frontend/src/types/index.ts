@@ -108,6 +108,7 @@ export interface ActionRecommendation {
   requires_human_approval: boolean;
   decision_deadline: string;
   time_sensitivity: 'critical' | 'high' | 'medium' | 'low';
+  time_sensitivity_rank: number;
   status: 'pending' | 'approved' | 'rejected' | 'executed' | 'expired';
   created_at: string;
   decided_at?: string;
@@ -189,9 +190,22 @@ export interface SituationGraph {
   last_updated: string;
 }
 
+export interface GraphPatchOp {
+  op: 'add' | 'replace' | 'remove';
+  path: string;
+  value?: unknown;
+}
+
+export interface GraphPatch {
+  from: number;
+  version: number;
+  ops: GraphPatchOp[];
+}
+
 export interface WSMessage {
   type: string;
   payload: unknown;
+  version?: number;
   timestamp: string;
 }
 
@@ -37,7 +37,7 @@ fi
 echo "🔧 Starting backend on http://localhost:8000..."
 cd "$ROOT_DIR/backend"
 source venv/bin/activate
-uvicorn main:app --reload --port 8000 &
+uvicorn main:app --reload --port 8000 --loop uvloop &
 BACKEND_PID=$!
 
 sleep 2